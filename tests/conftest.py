@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 root_dir_content = os.listdir(BASE_DIR)
 PROJECT_DIR_NAME = 'yatube'
@@ -37,3 +39,20 @@ pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def raise_on_nplusone(settings):
+    settings.NPLUSONE_DETECT = True
+    settings.NPLUSONE_RAISE = True
+
+
+@pytest.fixture(autouse=True)
+def verify_cached_users(settings):
+    settings.AUTH_USER_CACHE_VERIFY = True
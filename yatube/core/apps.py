@@ -1,5 +1,21 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .sqlite import apply_sqlite_pragmas
+        connection_created.connect(apply_sqlite_pragmas)
+
+        from .auth import invalidate_on_logout, invalidate_on_save
+        # Смена пароля — это тоже save(): set_password() сам не пишет.
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_on_save, sender=settings.AUTH_USER_MODEL
+            )
+        user_logged_out.connect(invalidate_on_logout)
@@ -0,0 +1,141 @@
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import caches
+from django.utils.functional import SimpleLazyObject
+
+from .caches import is_shared_cache
+
+AUTH_USER_CACHE_TIMEOUT = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300)
+
+
+class StaleUserCache(Exception):
+    pass
+
+
+def _cache():
+    return caches[settings.SESSION_CACHE_ALIAS]
+
+
+def user_cache_enabled():
+    """Кэш пользователей — только общий для воркеров, как и сессии.
+
+    В locmem смена пароля, блокировка или удаление в одном воркере
+    не сбросили бы пользователя в остальных.
+    """
+    return is_shared_cache(settings.SESSION_CACHE_ALIAS)
+
+
+def _version_key(user_id):
+    return f'auth:user:{user_id}:version'
+
+
+def _get_version(user_id):
+    """Версия записей пользователя в кэше, как версии лент в posts.cache."""
+    cache = _cache()
+    key = _version_key(user_id)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, int(time.time() * 1000), None)
+        value = cache.get(key)
+    return value
+
+
+def user_key(user_id, session_hash):
+    return (
+        f'auth:user:{user_id}:{_get_version(user_id)}:{session_hash}'
+    )
+
+
+def invalidate_user(user_id):
+    """Сбрасывает закэшированного пользователя во всех его сессиях."""
+    if not user_cache_enabled():
+        return
+    try:
+        _cache().incr(_version_key(user_id))
+    except ValueError:
+        # Версии нет — значит, и записей пользователя в кэше нет.
+        pass
+
+
+def user_state(user):
+    """Всё, что проверяет django.contrib.auth.get_user, плюс поля модели."""
+    if not user.is_authenticated:
+        return None
+    return [
+        (field.attname, getattr(user, field.attname))
+        for field in user._meta.concrete_fields
+    ]
+
+
+def get_user(request):
+    """request.user из кэша по id пользователя и хэшу пароля в сессии.
+
+    Промах кэша и всё необычное (нет хэша, неизвестный backend) —
+    обычный django.contrib.auth.get_user: он же проверяет хэш и
+    выкидывает сессию после смены пароля. В кэш попадает только
+    пользователь, прошедший эту проверку; сохранение, удаление
+    пользователя и выход сбрасывают его записи (см. signals);
+    QuerySet.update() сигналов не шлёт и до AUTH_USER_CACHE_TIMEOUT
+    остаётся незамеченным.
+    """
+    session = request.session
+    user_id = session.get(auth.SESSION_KEY)
+    session_hash = session.get(auth.HASH_SESSION_KEY)
+    if (user_id is None or not session_hash
+            or session.get(auth.BACKEND_SESSION_KEY)
+            not in settings.AUTHENTICATION_BACKENDS):
+        return auth.get_user(request)
+    key = user_key(user_id, session_hash)
+    user = _cache().get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            _cache().set(key, user, AUTH_USER_CACHE_TIMEOUT)
+        return user
+    if getattr(settings, 'AUTH_USER_CACHE_VERIFY', False):
+        verify(request, user)
+    return user
+
+
+def verify(request, cached):
+    """Сверяет пользователя из кэша с тем, что вернула бы база."""
+    fresh = auth.get_user(request)
+    if user_state(fresh) != user_state(cached):
+        raise StaleUserCache(
+            f'{request.path}: пользователь {cached.pk} в кэше '
+            f'не совпадает с базой'
+        )
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware, который берёт пользователя из кэша.
+
+    В установившемся режиме вместе с core.sessions запрос вошедшего
+    пользователя не делает ни одного SQL к django_session и auth_user.
+    AUTH_USER_CACHE_VERIFY сверяет каждое попадание с базой. Без общего
+    кэша — обычный AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        if not user_cache_enabled():
+            return
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+def get_cached_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+def invalidate_on_save(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+def invalidate_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
@@ -0,0 +1,53 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples, rank):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = max(0, -(-rank * len(ordered) // 100) - 1)
+    return ordered[index]
+
+
+def summarize(samples):
+    """Сводка по замерам в миллисекундах."""
+    summary = {
+        f'p{rank}': percentile(samples, rank) for rank in PERCENTILES
+    }
+    summary['mean'] = sum(samples) / len(samples) if samples else None
+    summary['count'] = len(samples)
+    return summary
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(path, results, **meta):
+    """Пишет результаты в JSON вместе с коммитом и окружением."""
+    report = {
+        'commit': _git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        **meta,
+        'results': results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
@@ -0,0 +1,32 @@
+from django.conf import settings
+
+# Кэши, которые живут в памяти одного процесса (или не хранят ничего).
+LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+FILE_BACKEND = 'django.core.cache.backends.filebased.FileBasedCache'
+
+
+def is_shared_cache(alias):
+    """Видят ли все воркеры сервера одно и то же содержимое кэша alias."""
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    return backend is not None and backend not in LOCAL_BACKENDS
+
+
+def file_session_settings(directory):
+    """Настройки core.sessions с FileBasedCache в directory.
+
+    Файловый кэш общий для процессов, как memcached: годится для
+    тестов и бенчмарков там, где memcached нет.
+    """
+    return {
+        'CACHES': {
+            **settings.CACHES,
+            'sessions': {
+                'BACKEND': FILE_BACKEND, 'LOCATION': directory,
+            },
+        },
+        'SESSION_ENGINE': 'core.sessions',
+        'SESSION_CACHE_ALIAS': 'sessions',
+    }
@@ -0,0 +1,59 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = threading.local()
+
+
+def read_from_replicas(enabled=True):
+    """Разрешает текущему потоку читать из реплик."""
+    _state.replicas = enabled
+
+
+def replicas_enabled():
+    return getattr(_state, 'replicas', False)
+
+
+def replica_reads():
+    """Могут ли чтения текущего потока попасть в отстающую реплику."""
+    return bool(getattr(settings, 'REPLICA_DATABASES', ())) and (
+        replicas_enabled()
+    )
+
+
+@contextmanager
+def primary_reads():
+    """Внутри блока поток читает только из default."""
+    enabled = replicas_enabled()
+    read_from_replicas(False)
+    try:
+        yield
+    finally:
+        read_from_replicas(enabled)
+
+
+class PrimaryReplicaRouter:
+    """Запись — в default, чтение — в случайную реплику.
+
+    Реплики перечислены в settings.REPLICA_DATABASES. Из них читают
+    только запросы, которым это разрешил ReplicaPinningMiddleware:
+    команды, shell и фоновые потоки работают с default и видят всё,
+    что сами записали. Внутри транзакции чтение тоже идёт в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'REPLICA_DATABASES', ())
+        if (not replicas or not replicas_enabled()
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и default.
+        return True
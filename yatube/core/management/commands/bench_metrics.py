@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmarks import summarize, write_report
+from core.metrics import registry
+from posts.models import Post
+
+METRICS_MIDDLEWARE = 'core.metrics.MetricsMiddleware'
+INSTRUMENTED_BACKEND = 'core.metrics.InstrumentedDjangoTemplates'
+PLAIN_BACKEND = 'django.template.backends.django.DjangoTemplates'
+
+
+def without_metrics():
+    """Настройки без MetricsMiddleware и с обычным движком шаблонов."""
+    return override_settings(
+        MIDDLEWARE=[
+            name for name in settings.MIDDLEWARE
+            if name != METRICS_MIDDLEWARE
+        ],
+        TEMPLATES=[
+            {**engine, 'BACKEND': PLAIN_BACKEND}
+            if engine['BACKEND'] == INSTRUMENTED_BACKEND else engine
+            for engine in settings.TEMPLATES
+        ],
+    )
+
+
+class Command(BaseCommand):
+    help = 'Замеряет накладные расходы MetricsMiddleware на запрос.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--output', default='bench/metrics.json')
+
+    def handle(self, *args, **options):
+        urls = [reverse('posts:index'), reverse('posts:about:author')]
+        post = Post.objects.first()
+        if post is not None:
+            urls.append(reverse('posts:post_detail', args=(post.pk,)))
+        results = {}
+        for url in urls:
+            with without_metrics():
+                plain = self.measure(url, options['requests'])
+            instrumented = self.measure(url, options['requests'])
+            results[url] = {
+                'plain_ms': plain,
+                'instrumented_ms': instrumented,
+                'overhead_p50_ms': instrumented['p50'] - plain['p50'],
+            }
+            self.stdout.write(
+                f'{url:30} без метрик p50={plain["p50"]:.3f} мс, '
+                f'с метриками p50={instrumented["p50"]:.3f} мс'
+            )
+        registry.clear()
+        write_report(options['output'], results, requests=options['requests'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
+
+    def measure(self, url, count):
+        client = Client()
+        # Прогрев: загрузка шаблонов и middleware не входит в замер.
+        client.get(url)
+        latencies = []
+        for _ in range(count):
+            cache.clear()
+            started = time.perf_counter()
+            client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+        return summarize(latencies)
@@ -0,0 +1,165 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import summarize, write_report
+from core.sqlite import PRODUCTION_PRAGMAS, pragma_statements
+
+SCHEMA = (
+    'CREATE TABLE post (id INTEGER PRIMARY KEY, text TEXT NOT NULL, '
+    'author_id INTEGER NOT NULL, pub_date REAL NOT NULL)',
+    'CREATE INDEX post_pub_date ON post (pub_date DESC, id DESC)',
+    'CREATE INDEX post_author ON post (author_id, pub_date DESC, id DESC)',
+)
+READ_SQL = (
+    'SELECT id, text, author_id, pub_date FROM post '
+    'WHERE author_id = ? ORDER BY pub_date DESC, id DESC LIMIT 10'
+)
+AUTHORS = 100
+
+# stock — как settings.py: соединение на каждый запрос, журнал DELETE.
+# tuned — как settings_production.py: постоянное соединение и PRAGMA.
+PROFILES = {
+    'stock': {'persistent': False, 'pragmas': {}},
+    'tuned': {'persistent': True, 'pragmas': PRODUCTION_PRAGMAS},
+}
+
+
+class Worker(threading.Thread):
+    def __init__(self, path, profile, writer, deadline, seed):
+        super().__init__(daemon=True)
+        self.path = path
+        self.profile = profile
+        self.writer = writer
+        self.deadline = deadline
+        self.random = random.Random(seed)
+        self.latencies = []
+        self.errors = 0
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None or not self.profile['persistent']:
+            if self.connection is not None:
+                self.connection.close()
+            # Как в django.db.backends.sqlite3: timeout по умолчанию 5 с.
+            self.connection = sqlite3.connect(
+                self.path, check_same_thread=False
+            )
+            for statement in pragma_statements(self.profile['pragmas']):
+                self.connection.execute(statement)
+        return self.connection
+
+    def operation(self, connection):
+        author_id = self.random.randrange(AUTHORS)
+        if not self.writer:
+            connection.execute(READ_SQL, (author_id,)).fetchall()
+            return
+        # Как post_create: чтение и запись в одной транзакции.
+        with connection:
+            connection.execute(READ_SQL, (author_id,)).fetchall()
+            connection.execute(
+                'INSERT INTO post (text, author_id, pub_date) '
+                'VALUES (?, ?, ?)',
+                ('Новый пост', author_id, time.time()),
+            )
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            started = time.perf_counter()
+            try:
+                self.operation(self.connect())
+            except sqlite3.OperationalError:
+                self.errors += 1
+                continue
+            self.latencies.append((time.perf_counter() - started) * 1000)
+        if self.connection is not None:
+            self.connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузка из параллельных читателей и писателей на SQLite: '
+        'стандартные настройки против settings_production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--output', default='bench/sqlite.json')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name, profile in PROFILES.items():
+                path = os.path.join(directory, f'{name}.sqlite3')
+                self.prepare(path, options['rows'])
+                results[name] = self.run_profile(path, profile, options)
+                result = results[name]
+                self.stdout.write(
+                    f'{name:6} чтений/с={result["reads_per_second"]:9.0f} '
+                    f'записей/с={result["writes_per_second"]:7.0f} '
+                    f'ошибок={result["lock_errors"]}'
+                )
+        write_report(
+            options['output'], results,
+            readers=options['readers'],
+            writers=options['writers'],
+            seconds=options['seconds'],
+            rows=options['rows'],
+            sqlite=sqlite3.sqlite_version,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
+
+    def prepare(self, path, rows):
+        connection = sqlite3.connect(path)
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+            now = time.time()
+            connection.executemany(
+                'INSERT INTO post (text, author_id, pub_date) '
+                'VALUES (?, ?, ?)',
+                (
+                    (f'Пост {num}', num % AUTHORS, now - num)
+                    for num in range(rows)
+                ),
+            )
+        connection.close()
+
+    def run_profile(self, path, profile, options):
+        deadline = time.monotonic() + options['seconds']
+        seed = options['seed']
+        workers = [
+            Worker(
+                path, profile, writer, deadline,
+                None if seed is None else seed + num,
+            )
+            for num, writer in enumerate(
+                [False] * options['readers'] + [True] * options['writers']
+            )
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        reads = [w for w in workers if not w.writer]
+        writes = [w for w in workers if w.writer]
+        read_latencies = [ms for w in reads for ms in w.latencies]
+        write_latencies = [ms for w in writes for ms in w.latencies]
+        return {
+            'reads_per_second': len(read_latencies) / options['seconds'],
+            'writes_per_second': len(write_latencies) / options['seconds'],
+            'lock_errors': sum(w.errors for w in workers),
+            'read_latency_ms': summarize(read_latencies),
+            'write_latency_ms': summarize(write_latencies),
+        }
@@ -0,0 +1,144 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Откуда из MEDIA_ROOT можно отдавать файлы: картинки постов
+# и миниатюры sorl. Всё остальное — 404.
+MEDIA_PUBLIC_DIRS = ('posts/', 'cache/')
+
+# Картинки постов названы по sha256 содержимого, миниатюры sorl —
+# по md5 ключа: по такому имени файл никогда не меняется.
+CONTENT_ADDRESSED = re.compile(r'/[0-9a-f]{32}(?:[0-9a-f]{32})?\.[^/]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+SHORT_CACHE = 'public, max-age=86400'
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """Файл, из которого читается не больше length байт с offset."""
+
+    def __init__(self, file, offset, length):
+        file.seek(offset)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """(начало, конец) из Range: bytes=…, конец включительно.
+
+    None — заголовка нет или он не поддерживается (несколько
+    диапазонов): отдаётся весь файл. ValueError — диапазон вне файла.
+    """
+    match = RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-500: последние 500 байт.
+        start, end = max(0, size - int(end)), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def resolve(path):
+    """Путь к файлу в MEDIA_ROOT после проверок доступа."""
+    path = posixpath.normpath(path).lstrip('/')
+    public = tuple(getattr(settings, 'MEDIA_PUBLIC_DIRS', MEDIA_PUBLIC_DIRS))
+    if not path.startswith(public):
+        raise Http404('Файл недоступен')
+    fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404(f'"{path}" не найден')
+    return path, fullpath
+
+
+def offload(mode, path, fullpath, content_type):
+    """Пустой ответ, по которому файл отдаст фронтенд-сервер.
+
+    mode 'accel' — nginx (X-Accel-Redirect на internal-location
+    MEDIA_ACCEL_PREFIX), 'sendfile' — Apache или lighttpd.
+    """
+    response = HttpResponse(content_type=content_type)
+    if mode == 'accel':
+        prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix + quote(path)
+    else:
+        response['X-Sendfile'] = str(fullpath)
+    return response
+
+
+def stream(request, fullpath, content_type, size):
+    """FileResponse с поддержкой одного диапазона Range."""
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    file = fullpath.open('rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(file, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def serve(request, path):
+    """Отдаёт загруженные файлы из MEDIA_ROOT.
+
+    Django только проверяет доступ, а байты передаёт фронтенд-сервер
+    (settings.MEDIA_OFFLOAD). Без него файл стримится через FileResponse.
+    """
+    path, fullpath = resolve(path)
+    stat = fullpath.stat()
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        stat.st_mtime, stat.st_size,
+    ):
+        return HttpResponseNotModified()
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+    mode = getattr(settings, 'MEDIA_OFFLOAD', None)
+    if mode:
+        response = offload(mode, path, fullpath, content_type)
+    else:
+        response = stream(request, fullpath, content_type, stat.st_size)
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = (
+        IMMUTABLE if CONTENT_ADDRESSED.search('/' + path) else SHORT_CACHE
+    )
+    return response
@@ -0,0 +1,239 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+# Метрики живут в памяти процесса: при нескольких воркерах Prometheus
+# опрашивает каждый отдельно.
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_state = threading.local()
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        f'{name}="{_escape(value)}"' for name, value in pairs
+    ) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        for labels, value in sorted(values.items()):
+            yield f'{self.name}{_labels(self.label_names, labels)}', value
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        # Счётчик только одной корзины: накопленные суммы по le
+        # считаются при выводе, а не на каждом наблюдении.
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(labels, (None, 0))
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self.values[labels] = (counts, total + value)
+
+    def samples(self):
+        with self.lock:
+            values = {
+                labels: (list(counts), total)
+                for labels, (counts, total) in self.values.items()
+            }
+        for labels, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            bounds = self.buckets + (float('inf'),)
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f'{self.name}_bucket' + _labels(
+                    self.label_names, labels, [('le', _number(bound))]
+                ), cumulative
+            yield f'{self.name}_sum' + _labels(
+                self.label_names, labels
+            ), total
+            yield f'{self.name}_count' + _labels(
+                self.label_names, labels
+            ), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def clear(self):
+        for metric in self.metrics:
+            with metric.lock:
+                metric.values.clear()
+
+    def exposition(self):
+        """Все метрики в текстовом формате Prometheus 0.0.4."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for sample, value in metric.samples():
+                lines.append(f'{sample} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+REQUESTS = registry.register(Counter(
+    'yatube_requests_total', 'Обработанные запросы.',
+    ('view', 'method', 'status'),
+))
+LATENCY = registry.register(Histogram(
+    'yatube_request_duration_seconds', 'Время ответа view.', ('view',),
+))
+QUERIES = registry.register(Histogram(
+    'yatube_request_db_queries', 'SQL-запросов на запрос.', ('view',),
+    QUERY_BUCKETS,
+))
+DB_TIME = registry.register(Histogram(
+    'yatube_request_db_seconds', 'Время SQL-запросов на запрос.', ('view',),
+))
+TEMPLATE_TIME = registry.register(Histogram(
+    'yatube_request_template_seconds', 'Время рендера шаблонов на запрос.',
+    ('view',),
+))
+RESPONSE_SIZE = registry.register(Histogram(
+    'yatube_response_size_bytes', 'Размер тела ответа.', ('view',),
+    SIZE_BUCKETS,
+))
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    if match.view_name:
+        return match.view_name
+    func = getattr(match.func, 'view_class', match.func)
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+class MetricsMiddleware:
+    """Пишет в registry время, SQL, рендер и размер ответа каждого view.
+
+    Метки — имя URL (posts:index), а не путь: иначе на каждый пост
+    и профиль заводилась бы отдельная серия.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        _state.stats = stats
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for db in connections.all():
+                    stack.enter_context(db.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            _state.stats = None
+        duration = time.perf_counter() - started
+        labels = (view_name(request),)
+        REQUESTS.inc(labels + (request.method, str(response.status_code)))
+        LATENCY.observe(labels, duration)
+        QUERIES.observe(labels, stats.queries)
+        DB_TIME.observe(labels, stats.db_seconds)
+        TEMPLATE_TIME.observe(labels, stats.template_seconds)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+        return response
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        stats = getattr(_state, 'stats', None)
+        if stats is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_seconds += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates, который считает время рендера для метрик.
+
+    Замеряются только шаблоны верхнего уровня: {% include %} рендерится
+    внутри них и уже входит в их время.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(
+            super().get_template(template_name).template, self
+        )
@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+
+from .db_router import read_from_replicas
+
+PIN_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaPinningMiddleware:
+    """Пускает чтения безопасных запросов в реплики.
+
+    Read-your-writes: изменяющий запрос целиком идёт в основную базу
+    и ставит cookie на REPLICA_PIN_SECONDS секунд: пока реплики
+    догоняют default, этот клиент читает только из неё. Cookie,
+    а не сессия: иначе саму сессию пришлось бы читать с реплики.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        unsafe = request.method not in SAFE_METHODS
+        read_from_replicas(
+            not unsafe and self.pinned_until(request) <= time.time()
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            read_from_replicas(False)
+        if unsafe and response.status_code < 400:
+            seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+            response.set_cookie(
+                PIN_COOKIE, str(int(time.time() + seconds)),
+                max_age=seconds, httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def pinned_until(self, request):
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            return 0
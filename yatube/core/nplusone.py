@@ -0,0 +1,132 @@
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Обёртки execute_wrapper из core сами лежат в стеке каждого запроса:
+# место вызова ищем за их пределами.
+_WRAPPER_FILES = {
+    os.path.join(os.path.dirname(__file__), name)
+    for name in ('nplusone.py', 'metrics.py', 'query_budget.py')
+}
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+
+
+class NPlusOneDetected(Exception):
+    pass
+
+
+def normalize(sql):
+    """SQL без конкретных значений: IN (%s, %s, …) и числа схлопываются."""
+    return _NUMBER.sub('N', _IN_LIST.sub('(...)', sql))
+
+
+def call_site():
+    """(строка шаблона, строка кода проекта), откуда пришёл запрос.
+
+    Шаблон — ближайший узел {{ }} / {% %} в стеке, код — ближайший
+    кадр из файлов проекта, не из Django и не из site-packages.
+    """
+    template_site = code_site = None
+    frame = sys._getframe(2)
+    while frame is not None and (template_site is None or code_site is None):
+        code = frame.f_code
+        if template_site is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template_site = f'{origin.template_name}:{token.lineno}'
+        filename = code.co_filename
+        if (code_site is None and filename.startswith(settings.BASE_DIR)
+                and filename not in _WRAPPER_FILES):
+            code_site = (
+                f'{os.path.relpath(filename, settings.BASE_DIR)}:'
+                f'{frame.f_lineno} ({code.co_name})'
+            )
+        frame = frame.f_back
+    return template_site, code_site
+
+
+class NPlusOneDetector:
+    """Собирает SELECT-запросы и ищет повторы из одного места.
+
+    Один и тот же нормализованный запрос, пришедший threshold и более
+    раз из одной строки шаблона и кода, — это подгрузка связанного
+    объекта в цикле: её лечат select_related/prefetch_related.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or getattr(
+            settings, 'NPLUSONE_THRESHOLD', 3
+        )
+        self.queries = Counter()
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() == 'SELECT':
+            self.queries[(normalize(sql),) + call_site()] += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for db in connections.all():
+            self._stack.enter_context(db.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def problems(self):
+        return [
+            (count, sql, template_site, code_site)
+            for (sql, template_site, code_site), count
+            in self.queries.most_common()
+            if count >= self.threshold
+        ]
+
+    def report(self, label):
+        lines = [f'{label}: похоже на N+1']
+        for count, sql, template_site, code_site in self.problems():
+            lines.append(
+                f'  {count} × {sql[:200]}\n'
+                f'    шаблон: {template_site or "—"}, код: {code_site or "—"}'
+            )
+        return '\n'.join(lines)
+
+    def check(self, label, raise_error=False):
+        if not self.problems():
+            return
+        message = self.report(label)
+        if raise_error:
+            raise NPlusOneDetected(message)
+        logger.warning(message)
+
+
+class NPlusOneMiddleware:
+    """Ищет N+1 в каждом запросе, если включён NPLUSONE_DETECT.
+
+    По умолчанию (DEBUG) пишет в лог; в тестах NPLUSONE_RAISE
+    превращает находку в ошибку.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'NPLUSONE_DETECT', settings.DEBUG):
+            return self.get_response(request)
+        with NPlusOneDetector() as detector:
+            response = self.get_response(request)
+        detector.check(
+            request.path, getattr(settings, 'NPLUSONE_RAISE', False)
+        )
+        return response
@@ -0,0 +1,82 @@
+import logging
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(max_queries):
+    """Объявляет, сколько SQL-запросов может сделать view.
+
+    Запросы считаются, когда включён QUERY_BUDGET_CHECK (по умолчанию —
+    в DEBUG). Превышение пишется в лог, а при QUERY_BUDGET_RAISE
+    (в тестах) приводит к исключению QueryBudgetExceeded. У потоковых
+    ответов считаются и запросы, сделанные при отдаче тела.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not getattr(settings, 'QUERY_BUDGET_CHECK', settings.DEBUG):
+                return view(request, *args, **kwargs)
+            executed = []
+            with counting_queries(executed):
+                response = view(request, *args, **kwargs)
+            response.query_count = len(executed)
+            if response.streaming:
+                response.streaming_content = _counted_stream(
+                    response, response.streaming_content, executed,
+                    request, max_queries,
+                )
+            else:
+                _check_budget(request, len(executed), max_queries)
+            return response
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def counting_queries(executed):
+    """Контекст, в котором SQL всех баз дописывается в executed.
+
+    Считаем запросы ко всем базам: чтения могут уйти в реплики.
+    execute_wrapper не открывает соединение с базой заранее.
+    """
+    def count_query(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+    with ExitStack() as stack:
+        for db in connections.all():
+            stack.enter_context(db.execute_wrapper(count_query))
+        yield
+
+
+def _counted_stream(response, content, executed, request, max_queries):
+    """Тело потокового ответа, по ходу отдачи считающее запросы."""
+    chunks = iter(content)
+    while True:
+        with counting_queries(executed):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        yield chunk
+    response.query_count = len(executed)
+    _check_budget(request, len(executed), max_queries)
+
+
+def _check_budget(request, count, max_queries):
+    if count <= max_queries:
+        return
+    message = (
+        f'{request.path}: {count} SQL-запросов при бюджете {max_queries}'
+    )
+    if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
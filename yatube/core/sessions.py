@@ -0,0 +1,71 @@
+import logging
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+from django.core.exceptions import ImproperlyConfigured
+
+from .caches import is_shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(cached_db.SessionStore):
+    """Сессии в кэше SESSION_CACHE_ALIAS с копией в базе.
+
+    Чтение обычно обходится кэшем, без SELECT из django_session.
+    В отличие от cached_db, недоступный кэш не роняет запрос:
+    ошибка пишется в лог, а сессия читается и пишется только в базу.
+    Кэш должен быть общим для воркеров, locmem не подходит.
+    """
+
+    def __init__(self, session_key=None):
+        if not is_shared_cache(settings.SESSION_CACHE_ALIAS):
+            raise ImproperlyConfigured(
+                f'core.sessions: кэш {settings.SESSION_CACHE_ALIAS} '
+                f'не общий для воркеров, сессии разойдутся'
+            )
+        super().__init__(session_key)
+
+    def _from_cache(self, method, *args):
+        try:
+            return getattr(self._cache, method)(*args)
+        except Exception:
+            logger.warning(
+                'Кэш сессий недоступен, работаем через базу', exc_info=True
+            )
+            return None
+
+    def load(self):
+        data = self._from_cache('get', self.cache_key)
+        if data is not None:
+            return data
+        session = self._get_session_from_db()
+        if session is None:
+            return {}
+        data = self.decode(session.session_data)
+        self._from_cache(
+            'set', self.cache_key, data,
+            self.get_expiry_age(expiry=session.expire_date),
+        )
+        return data
+
+    def exists(self, session_key):
+        if session_key and self._from_cache(
+            'has_key', self.cache_key_prefix + session_key
+        ):
+            return True
+        return super(cached_db.SessionStore, self).exists(session_key)
+
+    def save(self, must_create=False):
+        super(cached_db.SessionStore, self).save(must_create)
+        self._from_cache(
+            'set', self.cache_key, self._session, self.get_expiry_age()
+        )
+
+    def delete(self, session_key=None):
+        super(cached_db.SessionStore, self).delete(session_key)
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._from_cache('delete', self.cache_key_prefix + session_key)
@@ -0,0 +1,33 @@
+from django.conf import settings
+
+# WAL: читатели не блокируют писателя и наоборот; synchronous=NORMAL
+# в WAL не теряет согласованность, только последние транзакции при
+# сбое питания. busy_timeout заставляет писателя ждать блокировку,
+# а не сразу падать с "database is locked".
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+
+def pragma_statements(pragmas):
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Выполняет settings.SQLITE_PRAGMAS на каждом новом соединении.
+
+    PRAGMA действуют только в рамках соединения (кроме journal_mode,
+    который SQLite запоминает в файле), поэтому их нужно повторять
+    при каждом открытии.
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(pragmas):
+            cursor.execute(statement)
@@ -0,0 +1,83 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Имя с хэшем из ManifestStaticFilesStorage: bootstrap.min.0123456789ab.css
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Файлы без хэша (например, ссылки из старого HTML) кэшируем ненадолго.
+SHORT_CACHE = 'public, max-age=300'
+# Порядок предпочтения: brotli сжимает текст лучше gzip.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых q=0.
+
+    * разрешает только наши кодировки, которых нет в заголовке:
+    "*, gzip;q=0" принимает br, но не gzip.
+    """
+    qualities = {}
+    for part in header.split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    wildcard = qualities.pop('*', 0)
+    for coding, _ in ENCODINGS:
+        qualities.setdefault(coding, wildcard)
+    return {coding for coding, quality in qualities.items() if quality > 0}
+
+
+def serve(request, path):
+    """Отдаёт собранную статику из STATIC_ROOT.
+
+    Если клиент принимает br или gzip и рядом лежит сжатая копия
+    (её пишет core.storage при collectstatic), отдаётся она. Файлы
+    с хэшем в имени кэшируются навсегда: новая версия — новое имя.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404(f'"{path}" не найден')
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    served, encoding = fullpath, None
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for coding, suffix in ENCODINGS:
+        compressed = fullpath.with_name(fullpath.name + suffix)
+        if coding in accepted and compressed.is_file():
+            served, encoding = compressed, coding
+            break
+    stat = served.stat()
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        stat.st_mtime, stat.st_size,
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            served.open('rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = (
+        IMMUTABLE if HASHED_NAME.search(path) else SHORT_CACHE
+    )
+    return response
@@ -0,0 +1,67 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.html', '.txt', '.json', '.xml', '.map',
+)
+# Файлы меньше этого размера сжатие почти не уменьшает.
+MIN_COMPRESS_SIZE = 256
+
+
+def compress(content):
+    """Сжатые версии content: {'.gz': bytes, '.br': bytes}.
+
+    Brotli — только если установлен пакет brotli. Версии, которые
+    вышли не меньше оригинала, отбрасываются.
+    """
+    encoded = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded['.br'] = brotli.compress(content)
+    return {
+        suffix: data for suffix, data in encoded.items()
+        if len(data) < len(content)
+    }
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами в именах и заранее сжатые .gz/.br рядом.
+
+    collectstatic сам записывает всё нужное: staticfiles.json, файлы
+    с хэшами и их сжатые копии для core.static.serve.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        # Файлы со ссылками (css) проходят несколько раз, и хэш может
+        # поменяться: сжимаем только итоговое имя.
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        if not dry_run:
+            for hashed_name in hashed_names.values():
+                self.compress_file(hashed_name)
+
+    def compress_file(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return []
+        if self.size(name) < MIN_COMPRESS_SIZE:
+            return []
+        with self.open(name) as file:
+            content = file.read()
+        created = []
+        for suffix, data in compress(content).items():
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            created.append(self._save(compressed_name, ContentFile(data)))
+        return created
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class StrictDiscoverRunner(DiscoverRunner):
+    """Обычный раннер, но N+1 в любом запросе тестов — ошибка.
+
+    Заодно каждый пользователь из кэша сверяется с базой.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.NPLUSONE_DETECT = True
+        settings.NPLUSONE_RAISE = True
+        settings.AUTH_USER_CACHE_VERIFY = True
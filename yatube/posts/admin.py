@@ -1,5 +1,7 @@
 from django.contrib import admin
+
 from .models import Group, Post
+from .search import fts_available, search_ids_sql
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -15,6 +17,20 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по тексту через FTS5 вместо LIKE '%...%' по всей таблице.
+        if not search_term.strip() or not fts_available():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        sql, params = search_ids_sql(search_term)
+        # Не pk__in=RawSQL(...): Django оборачивает подзапрос в двойные
+        # скобки, и SQLite берёт из него только первую строку.
+        queryset = queryset.extra(
+            where=[f'{Post._meta.db_table}.id IN ({sql})'], params=params
+        )
+        return queryset, False
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
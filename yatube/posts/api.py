@@ -0,0 +1,150 @@
+from http import HTTPStatus
+
+from django.http import JsonResponse
+
+from core.query_budget import query_budget
+
+from .models import Group, Post, User
+from .paginators import KeysetPaginator
+from .views import POST_NUMBER
+
+MAX_LIMIT = 200
+
+
+def _image(post):
+    return post.image.url if post.image else None
+
+
+def _group(post):
+    return post.group.slug if post.group_id else None
+
+
+# Поле ответа -> (поля модели для only(), связь для select_related, геттер).
+FIELDS = {
+    'id': ((), None, lambda post: post.pk),
+    'text': (('text',), None, lambda post: post.text),
+    'pub_date': ((), None, lambda post: post.pub_date.isoformat()),
+    'author': (
+        ('author', 'author__username'), 'author',
+        lambda post: post.author.username,
+    ),
+    'group': (('group', 'group__slug'), 'group', _group),
+    'image': (('image',), None, _image),
+}
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def parse_fields(request):
+    """Список полей из ?fields=id,text; без параметра — все поля."""
+    value = request.GET.get('fields')
+    if not value:
+        return list(FIELDS)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = set(fields) - FIELDS.keys()
+    if unknown:
+        raise FieldsError(
+            'Неизвестные поля: {}'.format(', '.join(sorted(unknown)))
+        )
+    return fields
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', POST_NUMBER))
+    except ValueError:
+        return POST_NUMBER
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def sparse_queryset(queryset, fields):
+    """Читает из БД только то, что нужно для выбранных полей.
+
+    id и pub_date нужны всегда: из них строится курсор.
+    """
+    columns = ['pub_date']
+    related = []
+    for name in fields:
+        names, relation, _ = FIELDS[name]
+        columns.extend(names)
+        if relation:
+            related.append(relation)
+    return queryset.select_related(*related).only(*columns)
+
+
+def serialize(posts, fields):
+    getters = [(name, FIELDS[name][2]) for name in fields]
+    return [
+        {name: getter(post) for name, getter in getters} for post in posts
+    ]
+
+
+def error(message, status):
+    return JsonResponse({'detail': message}, status=status)
+
+
+def post_list_response(request, queryset, exists=None):
+    """Страница постов по курсору ?after= / ?before=.
+
+    exists вызывается, только если страница пуста, — чтобы отличить
+    пустую ленту от несуществующей группы или автора без лишнего
+    запроса на каждой странице.
+    """
+    try:
+        fields = parse_fields(request)
+    except FieldsError as exc:
+        return error(str(exc), HTTPStatus.BAD_REQUEST)
+    paginator = KeysetPaginator(
+        sparse_queryset(queryset, fields), parse_limit(request)
+    )
+    page = paginator.page_from_cursor(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    if not page.object_list and exists is not None and not exists():
+        return error('Не найдено', HTTPStatus.NOT_FOUND)
+    return JsonResponse({
+        'results': serialize(page.object_list, fields),
+        'next': page.next_cursor() if page.has_next() else None,
+        'previous': (
+            page.previous_cursor() if page.has_previous() else None
+        ),
+    })
+
+
+@query_budget(1)
+def index(request):
+    return post_list_response(request, Post.objects.all())
+
+
+@query_budget(2)
+def group_posts(request, slug):
+    return post_list_response(
+        request,
+        Post.objects.filter(group__slug=slug),
+        Group.objects.filter(slug=slug).exists,
+    )
+
+
+@query_budget(2)
+def profile(request, username):
+    return post_list_response(
+        request,
+        Post.objects.filter(author__username=username),
+        User.objects.filter(username=username).exists,
+    )
+
+
+@query_budget(1)
+def post_detail(request, post_id):
+    try:
+        fields = parse_fields(request)
+    except FieldsError as exc:
+        return error(str(exc), HTTPStatus.BAD_REQUEST)
+    try:
+        post = sparse_queryset(Post.objects.all(), fields).get(pk=post_id)
+    except Post.DoesNotExist:
+        return error('Не найдено', HTTPStatus.NOT_FOUND)
+    return JsonResponse(serialize([post], fields)[0])
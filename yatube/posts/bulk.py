@@ -0,0 +1,25 @@
+from django.db import connections, models, router
+
+from .models import Post
+
+
+def bulk_insert_posts(posts):
+    """Как Post.objects.bulk_create, но сохраняет заданный pub_date.
+
+    Поле объявлено с auto_now_add, и bulk_create перезаписал бы дату
+    текущим временем. raw-вставка берёт значения полей как есть, не
+    трогая общее для всех потоков поле модели. Сигналы не шлются, id
+    объектам не проставляются — как у bulk_create на SQLite.
+    """
+    posts = list(posts)
+    fields = [
+        field for field in Post._meta.concrete_fields
+        if not isinstance(field, models.AutoField)
+    ]
+    using = router.db_for_write(Post)
+    batch_size = max(connections[using].ops.bulk_batch_size(fields, posts), 1)
+    for start in range(0, len(posts), batch_size):
+        Post.objects._insert(
+            posts[start:start + batch_size], fields=fields,
+            raw=True, using=using,
+        )
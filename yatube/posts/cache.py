@@ -0,0 +1,230 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.http import HttpResponse
+
+from core.caches import is_shared_cache
+from core.db_router import primary_reads, replica_reads
+
+from .models import Post
+
+FEED_CACHE_TIMEOUT = getattr(settings, 'FEED_CACHE_TIMEOUT', 60 * 15)
+
+GENERATION_KEY = 'feed:generation'
+HITS_KEY = 'feed:stats:hits'
+MISSES_KEY = 'feed:stats:misses'
+
+
+def index_feed():
+    return 'feed:index'
+
+
+def group_index_feed():
+    return 'feed:groups'
+
+
+def group_feed(slug):
+    return f'feed:group:{slug}'
+
+
+def profile_feed(username):
+    return f'feed:profile:{username}'
+
+
+def post_feed(post_id):
+    return f'feed:post:{post_id}'
+
+
+def _get_counter(key):
+    """Текущее значение счётчика версий, создаёт его при первом обращении.
+
+    Начальное значение берётся из времени, а не с единицы: после очистки
+    кэша версия не повторит уже выданную ранее.
+    """
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, int(time.time() * 1000), None)
+        value = cache.get(key)
+    return value
+
+
+def get_feed_version(feed):
+    generation = _get_counter(GENERATION_KEY)
+    return f'{generation}.{_get_counter(feed + ":version")}'
+
+
+def invalidate_feeds(*feeds):
+    """Сбрасывает закэшированные страницы перечисленных лент."""
+    for feed in feeds:
+        try:
+            cache.incr(feed + ':version')
+        except ValueError:
+            # Версии нет — значит, и страниц этой ленты в кэше нет.
+            pass
+
+
+def invalidate_all_feeds():
+    """Сбрасывает все ленты разом, например после bulk_create."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        pass
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def feed_cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    return {'hits': hits, 'misses': misses}
+
+
+def reset_feed_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def page_key(feed, request):
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return f'{feed}:page:{get_feed_version(feed)}:{query}'
+
+
+def page_cache_enabled():
+    """Кэшировать ли страницы лент, как etags_enabled для ETag.
+
+    Сброс версии ленты в locmem одного воркера не виден остальным:
+    они отдавали бы старую страницу до FEED_CACHE_TIMEOUT. FEED_PAGE_CACHE
+    None — только при общем кэше, True/False — явно.
+    """
+    enabled = getattr(settings, 'FEED_PAGE_CACHE', None)
+    if enabled is None:
+        return is_shared_cache(DEFAULT_CACHE_ALIAS)
+    return enabled
+
+
+def cache_feed(feed_func):
+    """Кэширует отрендеренную страницу ленты для анонимных читателей.
+
+    `feed_func` получает аргументы view и возвращает имя ленты;
+    по нему страницы сбрасываются сигналами из posts/signals.py.
+    Промах рендерится из основной базы: отстающая реплика положила бы
+    в кэш старую страницу под новой версией ленты.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (request.method != 'GET' or request.user.is_authenticated
+                    or not page_cache_enabled()):
+                return view(request, *args, **kwargs)
+            key = page_key(feed_func(*args, **kwargs), request)
+            response = cached_page(key)
+            if response is not None:
+                return response
+            _count(MISSES_KEY)
+            with primary_reads():
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cached = (response.content, response['Content-Type'])
+                cache.set(key, cached, FEED_CACHE_TIMEOUT)
+            return response
+        # По этому атрибуту AnonymousFeedMiddleware находит ленту view.
+        wrapper.feed_func = feed_func
+        return wrapper
+    return decorator
+
+
+def cached_page(key):
+    """Закэшированная страница ленты для анонимного читателя или None."""
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    _count(HITS_KEY)
+    content, content_type = cached
+    return HttpResponse(content, content_type=content_type)
+
+
+def etags_enabled():
+    """Отдавать ли ETag лент и постов.
+
+    ETag считается по версиям лент в кэше. Если у каждого воркера свой
+    кэш (locmem), воркер, не видевший сброса, ответил бы 304 на
+    изменившуюся страницу. FEED_ETAGS=None — включать только при общем
+    кэше, True/False — явно.
+    """
+    enabled = getattr(settings, 'FEED_ETAGS', None)
+    if enabled is None:
+        return is_shared_cache(DEFAULT_CACHE_ALIAS)
+    return enabled
+
+
+def _etag(request, *versions, user=None):
+    if user is None:
+        user = request.user.pk if request.user.is_authenticated else 'anon'
+    raw = ':'.join([*versions, str(user), request.GET.urlencode()])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def anonymous_feed_etag(feed, request):
+    """ETag ленты для анонима: request.user не нужен, сессия не читается."""
+    if not etags_enabled():
+        return None
+    return _etag(request, get_feed_version(feed), user='anon')
+
+
+def _replica_body(request, cached):
+    """Может ли тело ответа отстать от версий лент в кэше.
+
+    Страница, прочитанная из реплики, бывает старее версии, по которой
+    считается ETag. Анонимам лент с @cache_feed (`cached`) отдаются
+    только страницы, отрендеренные из основной базы.
+    """
+    if not replica_reads():
+        return False
+    return not (
+        cached and page_cache_enabled() and request.method == 'GET'
+        and not request.user.is_authenticated
+    )
+
+
+def feed_etag(feed_func, cached=False):
+    """ETag ленты для @condition: считается по версии ленты, без рендера.
+
+    `cached` — view обёрнут в @cache_feed той же ленты.
+    """
+    def etag(request, *args, **kwargs):
+        if not etags_enabled() or _replica_body(request, cached):
+            return None
+        return _etag(
+            request, get_feed_version(feed_func(*args, **kwargs))
+        )
+    return etag
+
+
+def post_etag(request, post_id):
+    """ETag страницы поста: версии поста, ленты автора и группы.
+
+    На странице выводятся счётчик постов автора и название группы,
+    поэтому их изменения тоже должны менять ETag.
+    """
+    if not etags_enabled() or _replica_body(request, cached=False):
+        return None
+    row = Post.objects.filter(pk=post_id).values_list(
+        'author__username', 'group__slug'
+    ).first()
+    if row is None:
+        return None
+    username, slug = row
+    versions = [
+        get_feed_version(post_feed(post_id)),
+        get_feed_version(profile_feed(username)),
+    ]
+    if slug is not None:
+        versions.append(get_feed_version(group_feed(slug)))
+    return _etag(request, *versions)
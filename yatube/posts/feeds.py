@@ -0,0 +1,158 @@
+import re
+from itertools import chain
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import rfc2822_date, rfc3339_date
+from django.views.decorators.http import condition
+
+from core.query_budget import query_budget
+
+from .cache import feed_etag, group_feed, index_feed, profile_feed
+from .models import Group, Post, User
+from .paginators import KeysetPaginator
+
+FEED_CHUNK_SIZE = getattr(settings, 'SYNDICATION_CHUNK_SIZE', 500)
+# Сколько последних постов в ленте; None — все.
+FEED_MAX_ITEMS = getattr(settings, 'SYNDICATION_MAX_ITEMS', 50)
+TITLE_LENGTH = 30
+# Символы, которых не может быть в XML 1.0 даже в виде ссылок &#…;.
+INVALID_XML_CHARS = re.compile(
+    '[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]'
+)
+
+CONTENT_TYPES = {
+    'atom': 'application/atom+xml; charset=utf-8',
+    'rss': 'application/rss+xml; charset=utf-8',
+}
+
+
+def syndication_etag(feed_func):
+    """ETag ленты для @condition, отдельный для Atom и RSS."""
+    etag = feed_etag(feed_func)
+
+    def kind_etag(request, kind, **kwargs):
+        value = etag(request, **kwargs)
+        return None if value is None else f'{value}-{kind}'
+    return kind_etag
+
+
+def _escape(text):
+    return escape(INVALID_XML_CHARS.sub('', text))
+
+
+def _atom(request, title, link, posts, updated):
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f'<title>{_escape(title)}</title>'
+        f'<link href={quoteattr(link)} rel="alternate"/>'
+        f'<link href={quoteattr(request.build_absolute_uri())} rel="self"/>'
+        f'<id>{_escape(link)}</id>'
+        f'<updated>{rfc3339_date(updated)}</updated>'
+    )
+    for post in posts:
+        url = request.build_absolute_uri(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        yield (
+            '<entry>'
+            f'<title>{_escape(post.text[:TITLE_LENGTH])}</title>'
+            f'<link href={quoteattr(url)} rel="alternate"/>'
+            f'<id>{_escape(url)}</id>'
+            f'<updated>{rfc3339_date(post.pub_date)}</updated>'
+            f'<author><name>{_escape(post.author.username)}</name></author>'
+            f'<content type="text">{_escape(post.text)}</content>'
+            '</entry>'
+        )
+    yield '</feed>\n'
+
+
+def _rss(request, title, link, posts, updated):
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rss version="2.0"><channel>'
+        f'<title>{_escape(title)}</title>'
+        f'<link>{_escape(link)}</link>'
+        f'<description>{_escape(title)}</description>'
+        f'<lastBuildDate>{rfc2822_date(updated)}</lastBuildDate>'
+    )
+    for post in posts:
+        url = request.build_absolute_uri(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        yield (
+            '<item>'
+            f'<title>{_escape(post.text[:TITLE_LENGTH])}</title>'
+            f'<link>{_escape(url)}</link>'
+            f'<guid>{_escape(url)}</guid>'
+            f'<pubDate>{rfc2822_date(post.pub_date)}</pubDate>'
+            f'<description>{_escape(post.text)}</description>'
+            '</item>'
+        )
+    yield '</channel></rss>\n'
+
+
+WRITERS = {'atom': _atom, 'rss': _rss}
+
+
+def stream_feed(request, kind, title, link, post_list):
+    """Отдаёт ленту потоком: посты читаются из БД пачками по iterator().
+
+    Порядок тот же, что и у страниц лент в posts/views.py.
+    """
+    if kind not in WRITERS:
+        raise Http404('Неизвестный формат ленты')
+    post_list = post_list.select_related('author').order_by(
+        *KeysetPaginator.ordering
+    )
+    if FEED_MAX_ITEMS is not None:
+        post_list = post_list[:FEED_MAX_ITEMS]
+    posts = post_list.iterator(chunk_size=FEED_CHUNK_SIZE)
+    # Первый пост — дата обновления ленты, без отдельного запроса.
+    latest = next(posts, None)
+    content = WRITERS[kind](
+        request,
+        title,
+        request.build_absolute_uri(link),
+        chain([latest], posts) if latest is not None else (),
+        latest.pub_date if latest is not None else timezone.now(),
+    )
+    return StreamingHttpResponse(
+        (chunk.encode() for chunk in content),
+        content_type=CONTENT_TYPES[kind],
+    )
+
+
+@query_budget(3)
+@condition(etag_func=syndication_etag(index_feed))
+def index(request, kind):
+    return stream_feed(
+        request, kind, 'Yatube: последние записи',
+        reverse('posts:index'), Post.objects.all(),
+    )
+
+
+@query_budget(4)
+@condition(etag_func=syndication_etag(group_feed))
+def group_posts(request, kind, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return stream_feed(
+        request, kind, f'Yatube: {group.title}',
+        reverse('posts:group_list', args=(slug,)), group.posts.all(),
+    )
+
+
+@query_budget(4)
+@condition(etag_func=syndication_etag(profile_feed))
+def profile(request, kind, username):
+    author = get_object_or_404(User, username=username)
+    return stream_feed(
+        request, kind,
+        f'Yatube: записи {author.get_full_name() or author.username}',
+        reverse('posts:profile', args=(username,)), author.posts.all(),
+    )
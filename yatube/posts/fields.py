@@ -0,0 +1,23 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class JSONTextField(models.TextField):
+    """JSON в текстовой колонке.
+
+    В Django 2.2 JSONField есть только для PostgreSQL, а здесь SQLite.
+    По полю нельзя фильтровать: оно для денормализованных данных,
+    которые читаются целиком.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return json.loads(value)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
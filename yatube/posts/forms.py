@@ -1,8 +1,23 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
+
+from .images import store_image
 from .models import Post
 
 
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
-        fields = ('text', 'group')
+        fields = ('text', 'group', 'image')
+
+    def clean_image(self):
+        """Новую картинку сразу уменьшаем и сохраняем под её хэшем.
+
+        В модель попадает уже имя файла, поэтому исходник в posts/
+        не записывается. Если форма не пройдёт проверку из-за других
+        полей, файл останется, но повторная отправка его не дублирует.
+        """
+        image = self.cleaned_data.get('image')
+        if isinstance(image, UploadedFile):
+            return store_image(image)
+        return image
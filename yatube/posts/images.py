@@ -0,0 +1,87 @@
+import hashlib
+import io
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+POST_IMAGE_DIR = 'posts'
+POST_IMAGE_MAX_SIZE = getattr(settings, 'POST_IMAGE_MAX_SIZE', (1920, 1920))
+POST_IMAGE_QUALITY = getattr(settings, 'POST_IMAGE_QUALITY', 85)
+
+# Картинки с прозрачностью остаются PNG, остальные становятся JPEG.
+FORMATS = {
+    'JPEG': ('jpg', {'quality': POST_IMAGE_QUALITY, 'optimize': True,
+                     'progressive': True}),
+    'PNG': ('png', {'optimize': True}),
+}
+
+
+def spool_upload(upload):
+    """Копирует загрузку во временный файл по частям и считает её хэш."""
+    digest = hashlib.sha256()
+    spooled = tempfile.TemporaryFile()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+
+
+def image_name(digest, extension):
+    """posts/ab/abcdef….jpg: путь по хэшу исходного файла."""
+    return os.path.join(
+        POST_IMAGE_DIR, digest[:2], f'{digest}.{extension}'
+    )
+
+
+def reencode(image, image_format):
+    """Поворачивает по EXIF, ужимает до POST_IMAGE_MAX_SIZE и кодирует.
+
+    Перекодирование заодно выбрасывает метаданные исходника.
+    """
+    if image.format == 'JPEG':
+        # Декодировать JPEG сразу в уменьшенном масштабе — в разы
+        # быстрее и экономнее по памяти, чем полное декодирование.
+        image.draft('RGB', POST_IMAGE_MAX_SIZE)
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(POST_IMAGE_MAX_SIZE, Image.LANCZOS)
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image_format == 'PNG' and image.mode not in ('RGBA', 'LA'):
+        image = image.convert('RGBA')
+    output = io.BytesIO()
+    image.save(output, image_format, **FORMATS[image_format][1])
+    return output.getvalue()
+
+
+def store_image(upload, storage=default_storage):
+    """Сохраняет загруженную картинку и возвращает её имя в storage.
+
+    Одинаковые загрузки получают одно имя и хранятся один раз: если
+    файл с таким хэшем уже есть, картинка даже не декодируется.
+    """
+    spooled, digest = spool_upload(upload)
+    with spooled:
+        try:
+            image = Image.open(spooled)
+            image_format = 'PNG' if has_alpha(image) else 'JPEG'
+            name = image_name(digest, FORMATS[image_format][0])
+            if storage.exists(name):
+                return name
+            content = reencode(image, image_format)
+        except (OSError, Image.DecompressionBombError):
+            raise ValidationError(
+                'Загрузите правильное изображение.', code='invalid_image'
+            )
+    return storage.save(name, ContentFile(content))
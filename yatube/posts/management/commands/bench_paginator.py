@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.template import Template
+from django.template.context import Context
+from django.template.loader import get_template
+
+from core.benchmarks import summarize, write_report
+from posts.models import Post
+from posts.views import POST_NUMBER
+
+# Прежняя разметка: ссылка на каждую страницу ленты.
+FULL_RANGE = Template(
+    '{% for i in page_obj.paginator.page_range %}'
+    '<li class="page-item"><a class="page-link" href="?page={{ i }}">'
+    '{{ i }}</a></li>{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет рендер includes/paginator.html на ленте из всех постов '
+        'в сравнении с перебором page_range.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--output', default='bench/paginator.json')
+
+    def handle(self, *args, **options):
+        paginator = Paginator(Post.objects.all(), POST_NUMBER)
+        if paginator.num_pages < 2:
+            raise CommandError('Мало постов: сначала запустите seed_posts.')
+        window = get_template('includes/paginator.html').template
+        numbers = {
+            'first': 1,
+            'middle': paginator.num_pages // 2,
+            'last': paginator.num_pages,
+        }
+        results = {}
+        for position, number in numbers.items():
+            page = paginator.page(number)
+            for name, template in (('window', window), ('full', FULL_RANGE)):
+                key = f'{name} {position}'
+                results[key] = self.measure(
+                    template, page, options['requests']
+                )
+                latency = results[key]['latency_ms']
+                self.stdout.write(
+                    f'{key:15} p50={latency["p50"]:8.2f} '
+                    f'p95={latency["p95"]:8.2f} ms  '
+                    f'links={results[key]["links"]}'
+                )
+        write_report(
+            options['output'], results,
+            posts=paginator.count,
+            pages=paginator.num_pages,
+            requests=options['requests'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
+
+    def measure(self, template, page, count):
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            html = template.render(Context({'page_obj': page}))
+            latencies.append((time.perf_counter() - started) * 1000)
+        return {
+            'latency_ms': summarize(latencies),
+            'links': html.count('<li'),
+            'bytes': len(html.encode()),
+        }
@@ -0,0 +1,126 @@
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmarks import summarize, write_report
+from core.caches import file_session_settings, is_shared_cache
+from posts.models import Post
+
+FAST_PATH_MIDDLEWARE = 'posts.middleware.AnonymousFeedMiddleware'
+
+# db — сессии в django_session и полный стек middleware для всех.
+# cache — core.sessions и отдача лент анонимам до SessionMiddleware.
+PROFILES = {'db': {'cache': False}, 'cache': {'cache': True}}
+
+
+def profile_settings(profile, directory):
+    """Настройки профиля; без memcached кэш сессий — файлы в directory."""
+    middleware = [
+        name for name in settings.MIDDLEWARE
+        if profile['cache'] or name != FAST_PATH_MIDDLEWARE
+    ]
+    if not profile['cache']:
+        sessions = {
+            'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        }
+    elif settings.SESSION_ENGINE == 'core.sessions' and is_shared_cache(
+        settings.SESSION_CACHE_ALIAS
+    ):
+        sessions = {}
+    else:
+        sessions = file_session_settings(directory)
+    # Страницы лент в кэше у обоих профилей: сравниваются только сессии.
+    return override_settings(
+        MIDDLEWARE=middleware, FEED_PAGE_CACHE=True, **sessions
+    )
+
+
+class QueryCounter:
+    def __init__(self):
+        self.total = 0
+        self.sessions = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        if 'django_session' in sql:
+            self.sessions += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пропускная способность лент для анонимов и вошедших: '
+        'сессии в базе против сессий в кэше с быстрым путём.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--output', default='bench/sessions.json')
+
+    def handle(self, *args, **options):
+        post = Post.objects.select_related('author').first()
+        if post is None:
+            raise CommandError('Нет постов: сначала запустите seed_posts.')
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:profile', args=(post.author.username,)),
+        ]
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name, profile in PROFILES.items():
+                with profile_settings(profile, directory):
+                    if profile['cache']:
+                        session_cache = settings.CACHES[
+                            settings.SESSION_CACHE_ALIAS
+                        ]['BACKEND']
+                    self.measure_profile(
+                        name, post.author, urls, options['requests'], results
+                    )
+        write_report(
+            options['output'], results,
+            urls=urls,
+            requests=options['requests'],
+            session_cache=session_cache,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
+
+    def measure_profile(self, name, author, urls, count, results):
+        logged_in = Client()
+        logged_in.force_login(author)
+        clients = {'anonymous': Client(), 'logged_in': logged_in}
+        for traffic, client in clients.items():
+            label = f'{name} {traffic}'
+            results[label] = result = self.measure(client, urls, count)
+            self.stdout.write(
+                f'{label:20} запросов/с={result["rps"]:8.0f} '
+                f'p50={result["latency_ms"]["p50"]:.3f} мс '
+                f'SQL к сессиям={result["session_queries"]}'
+            )
+
+    def measure(self, client, urls, count):
+        # Прогрев: страницы лент уже в кэше, как у живого сайта.
+        for url in urls:
+            client.get(url)
+        latencies = []
+        counter = QueryCounter()
+        started = time.perf_counter()
+        for num in range(count):
+            url = urls[num % len(urls)]
+            with connections['default'].execute_wrapper(counter):
+                request_started = time.perf_counter()
+                client.get(url)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        elapsed = time.perf_counter() - started
+        return {
+            'rps': count / elapsed,
+            'latency_ms': summarize(latencies),
+            'queries_per_request': counter.total / count,
+            'session_queries': counter.sessions,
+        }
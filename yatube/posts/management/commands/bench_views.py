@@ -0,0 +1,179 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.http import JsonResponse
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmarks import summarize, write_report
+from core.query_budget import counting_queries
+from posts import urls
+from posts.api import FIELDS, MAX_LIMIT, serialize, sparse_queryset
+from posts.models import Group, Post
+from posts.paginators import encode_cursor
+from posts.views import POST_NUMBER
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет все URL из posts.urls через тестовый клиент и пишет '
+        'p50/p95/p99 задержки и число запросов в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument(
+            '--depth', type=int, default=1000,
+            help='Номер страницы для замеров глубокой пагинации.',
+        )
+        parser.add_argument(
+            '--cached', action='store_true',
+            help='Не очищать кэш лент между запросами.',
+        )
+        parser.add_argument('--output', default='bench/views.json')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        max_pk = Post.objects.aggregate(Max('pk'))['pk__max']
+        if max_pk is None:
+            raise CommandError('Нет постов: сначала запустите seed_posts.')
+        self.post = Post.objects.select_related('author', 'group').filter(
+            pk__gte=self.random.randint(1, max_pk)
+        ).order_by('pk').first()
+        self.group = self.post.group or Group.objects.filter(
+            posts__isnull=False
+        ).first()
+        self.author_client = Client()
+        self.author_client.force_login(self.post.author)
+        self.anonymous_client = Client()
+
+        results = {}
+        for name, client, url, data in self.scenarios(options['depth']):
+            results[name] = self.measure(
+                client, url, data, options['requests'], options['cached']
+            )
+            latency = results[name]['latency_ms']
+            self.stdout.write(
+                f'{name:40} p50={latency["p50"]:8.2f} '
+                f'p95={latency["p95"]:8.2f} p99={latency["p99"]:8.2f} ms  '
+                f'queries={results[name]["queries"]["p50"]}'
+            )
+        results['api serialize'] = self.measure_serialization(
+            options['requests']
+        )
+        latency = results['api serialize']['latency_ms']
+        self.stdout.write(
+            f'{"api serialize":40} p50={latency["p50"]:8.2f} '
+            f'p95={latency["p95"]:8.2f} p99={latency["p99"]:8.2f} ms  '
+            f'posts={results["api serialize"]["posts"]}'
+        )
+        write_report(
+            options['output'], results,
+            posts=Post.objects.count(),
+            requests=options['requests'],
+            cached=options['cached'],
+            database=settings.DATABASES['default']['ENGINE'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
+
+    def url_kwargs(self, name):
+        group = self.group
+        return {
+            'group_list': {'slug': group.slug} if group else None,
+            'profile': {'username': self.post.author.username},
+            'post_detail': {'post_id': self.post.pk},
+            'post_edit': {'post_id': self.post.pk},
+            'api_post': {'post_id': self.post.pk},
+            'api_group': {'slug': group.slug} if group else None,
+            'api_profile': {'username': self.post.author.username},
+            'index_feed': {'kind': 'atom'},
+            'group_feed': {'slug': group.slug, 'kind': 'atom'}
+            if group else None,
+            'profile_feed': {
+                'username': self.post.author.username, 'kind': 'atom'
+            },
+        }.get(name, {})
+
+    def scenarios(self, depth):
+        """Сценарии: каждый URL posts.urls, у лент — ещё и глубокие страницы.
+
+        Возвращает кортежи (название, клиент, url, GET-параметры).
+        """
+        feeds = {
+            'index': Post.objects.all(),
+            'group_list': Post.objects.filter(group=self.group),
+            'profile': Post.objects.filter(author=self.post.author),
+        }
+        for pattern in urls.urlpatterns:
+            name = getattr(pattern, 'name', None)
+            if name is None:
+                continue
+            kwargs = self.url_kwargs(name)
+            if kwargs is None:
+                continue
+            url = reverse(f'{urls.app_name}:{name}', kwargs=kwargs or None)
+            yield name, self.anonymous_client, url, {}
+            yield f'{name} (author)', self.author_client, url, {}
+            if name in feeds:
+                yield f'{name} ?page={depth}', self.anonymous_client, url, {
+                    'page': depth
+                }
+                yield f'{name} ?after=', self.anonymous_client, url, {
+                    'after': encode_cursor(self.deep_post(feeds[name], depth))
+                }
+            if name == 'api_index':
+                yield (
+                    f'{name} ?limit={MAX_LIMIT}', self.anonymous_client, url,
+                    {'limit': MAX_LIMIT},
+                )
+
+    def deep_post(self, queryset, depth):
+        """Пост, после которого начинается страница depth ленты."""
+        offset = (depth - 1) * POST_NUMBER - 1
+        offset = max(0, min(offset, queryset.count() - 1))
+        return queryset.order_by('-pub_date', '-pk')[offset]
+
+    def measure_serialization(self, count):
+        """serialize() и JSON самой большой страницы API, без SQL."""
+        fields = list(FIELDS)
+        posts = list(sparse_queryset(
+            Post.objects.order_by('-pub_date', '-pk'), fields
+        )[:MAX_LIMIT])
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            JsonResponse({'results': serialize(posts, fields)})
+            latencies.append((time.perf_counter() - started) * 1000)
+        return {'posts': len(posts), 'latency_ms': summarize(latencies)}
+
+    def measure(self, client, url, data, count, cached):
+        latencies = []
+        queries = []
+        for _ in range(count):
+            if not cached:
+                cache.clear()
+            # Все базы, как в @query_budget: чтения идут и в реплики.
+            executed = []
+            with counting_queries(executed):
+                started = time.perf_counter()
+                response = client.get(url, data)
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(executed))
+        return {
+            'url': url,
+            'params': data,
+            'status': response.status_code,
+            'bytes': len(
+                b''.join(response.streaming_content) if response.streaming
+                else response.content
+            ),
+            'latency_ms': summarize(latencies),
+            'queries': summarize(queries),
+        }
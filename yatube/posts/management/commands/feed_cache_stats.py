@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.cache import (feed_cache_stats, page_cache_enabled,
+                         reset_feed_cache_stats)
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша лент.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Обнулить счётчики после вывода.',
+        )
+
+    def handle(self, *args, **options):
+        if not page_cache_enabled():
+            raise CommandError(
+                'Кэш лент выключен: нужен общий кэш default '
+                '(DJANGO_MEMCACHED).'
+            )
+        stats = feed_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f'hits: {stats["hits"]}, misses: {stats["misses"]}, '
+            f'hit ratio: {ratio:.1%}'
+        )
+        if options['reset']:
+            reset_feed_cache_stats()
@@ -0,0 +1,32 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.thumbnails import THUMBNAIL_WORKERS, generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Заранее создаёт миниатюры для всех картинок постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=THUMBNAIL_WORKERS,
+            help='Сколько картинок обрабатывать параллельно.',
+        )
+
+    def handle(self, *args, **options):
+        names = Post.objects.exclude(image='').order_by().values_list(
+            'image', flat=True
+        ).distinct().iterator()
+        started = time.monotonic()
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for ok in executor.map(generate_thumbnails, names):
+                done += 1
+                failed += not ok
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано картинок: {done}, ошибок: {failed}, '
+            f'за {time.monotonic() - started:.1f} с.'
+        ))
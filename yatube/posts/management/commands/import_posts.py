@@ -0,0 +1,224 @@
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.bulk import bulk_insert_posts
+from posts.cache import invalidate_all_feeds
+from posts.models import Group, Post
+from posts.stats import refresh_author_summary, refresh_group_summary
+
+User = get_user_model()
+
+
+class RowError(Exception):
+    pass
+
+
+def string_field(row, name):
+    """Поле строки как str или None; JSONL может прислать список и т. п."""
+    value = row.get(name)
+    if value is not None and not isinstance(value, str):
+        raise RowError(f'{name} должен быть строкой: {value!r}')
+    return value
+
+
+def parse_pub_date(value):
+    """Дата из строки импорта; без неё — текущее время."""
+    if not value:
+        return timezone.now()
+    try:
+        pub_date = parse_datetime(value)
+    except ValueError:
+        # Формат верный, но такой даты нет: 2020-13-45.
+        pub_date = None
+    if pub_date is None:
+        raise RowError(f'неверная дата {value!r}')
+    if timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date)
+    return pub_date
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково импортирует посты из JSONL или CSV. Строка: text, author '
+        '(username), необязательные group (slug) и pub_date (ISO 8601).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с постами или - для stdin.')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default=None,
+            help='По умолчанию определяется по расширению файла.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--checkpoint', default=None,
+            help='Файл контрольной точки (по умолчанию <path>.checkpoint).',
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Пропустить строки, импортированные до контрольной точки.',
+        )
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Остановиться на первой ошибочной строке.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or (
+            'csv' if path.endswith('.csv') else 'jsonl'
+        )
+        self.checkpoint = options['checkpoint'] or (
+            None if path == '-' else f'{path}.checkpoint'
+        )
+        self.strict = options['strict']
+        self.authors = {}
+        self.groups = {}
+
+        done = self.read_checkpoint() if options['resume'] else 0
+        imported = skipped = 0
+        started = time.monotonic()
+        with self.open_input(path) as file:
+            rows = self.read_rows(file, fmt)
+            for _ in islice(rows, done):
+                pass
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                created, errors = self.import_batch(batch)
+                imported += created
+                skipped += errors
+                done += len(batch)
+                self.write_checkpoint(done)
+                elapsed = max(time.monotonic() - started, 1e-9)
+                self.stdout.write(
+                    f'Строк: {done}, импортировано: {imported}, '
+                    f'{imported / elapsed:.0f} строк/с'
+                )
+        if imported:
+            invalidate_all_feeds()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано {imported} постов за {elapsed:.1f} с '
+            f'({imported / elapsed:.0f} строк/с), '
+            f'пропущено строк: {skipped}.'
+        ))
+        self.remove_checkpoint()
+
+    def open_input(self, path):
+        if path == '-':
+            return open(sys.stdin.fileno(), encoding='utf-8', closefd=False)
+        try:
+            return open(path, encoding='utf-8', newline='')
+        except OSError as error:
+            raise CommandError(error)
+
+    def read_rows(self, file, fmt):
+        """Генератор пар (номер строки, словарь) без чтения файла целиком."""
+        if fmt == 'csv':
+            for number, row in enumerate(csv.DictReader(file), start=2):
+                yield number, row
+            return
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as error:
+                yield number, error
+
+    def resolve(self, batch):
+        """Дополняет карты username -> id и slug -> id по данным пачки.
+
+        Нестроковые значения пропускаются: их отвергнет build_post.
+        """
+        rows = [row for _, row in batch if isinstance(row, dict)]
+        usernames = {
+            row.get('author') for row in rows
+            if isinstance(row.get('author'), str)
+        } - self.authors.keys()
+        slugs = {
+            row.get('group') for row in rows
+            if isinstance(row.get('group'), str)
+        } - self.groups.keys() - {''}
+        if usernames:
+            self.authors.update(User.objects.filter(
+                username__in=usernames
+            ).values_list('username', 'pk'))
+        if slugs:
+            self.groups.update(
+                Group.objects.filter(slug__in=slugs).values_list('slug', 'pk')
+            )
+
+    def build_post(self, row):
+        if not isinstance(row, dict):
+            raise RowError(f'не удалось разобрать строку: {row}')
+        text = string_field(row, 'text')
+        if not text:
+            raise RowError('пустой text')
+        author = string_field(row, 'author')
+        author_id = self.authors.get(author)
+        if author_id is None:
+            raise RowError(f'автор {author!r} не найден')
+        group_id = None
+        group = string_field(row, 'group')
+        if group:
+            group_id = self.groups.get(group)
+            if group_id is None:
+                raise RowError(f'группа {group!r} не найдена')
+        return Post(
+            text=text,
+            author_id=author_id,
+            group_id=group_id,
+            pub_date=parse_pub_date(string_field(row, 'pub_date')),
+        )
+
+    def import_batch(self, batch):
+        self.resolve(batch)
+        posts = []
+        errors = 0
+        for number, row in batch:
+            try:
+                posts.append(self.build_post(row))
+            except RowError as error:
+                if self.strict:
+                    raise CommandError(f'Строка {number}: {error}')
+                self.stderr.write(f'Строка {number}: {error}')
+                errors += 1
+        with transaction.atomic():
+            bulk_insert_posts(posts)
+            # bulk_create не шлёт сигналы, поэтому счётчики двигаем сами.
+            for author_id in {post.author_id for post in posts}:
+                refresh_author_summary(author_id, create=True)
+            for group_id in {post.group_id for post in posts} - {None}:
+                refresh_group_summary(group_id, create=True)
+        return len(posts), errors
+
+    def read_checkpoint(self):
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return 0
+        with open(self.checkpoint) as file:
+            return int(file.read().strip() or 0)
+
+    def write_checkpoint(self, done):
+        if self.checkpoint is None:
+            return
+        temporary = f'{self.checkpoint}.tmp'
+        with open(temporary, 'w') as file:
+            file.write(str(done))
+        os.replace(temporary, self.checkpoint)
+
+    def remove_checkpoint(self):
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
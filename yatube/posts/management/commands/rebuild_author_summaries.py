@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import invalidate_all_feeds
+from posts.stats import rebuild_author_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает сводки авторов (число постов, последний пост, '
+        'группы, последние посты) по таблице постов.'
+    )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_author_summaries()
+        # Шапки профилей в кэше лент собраны по старым сводкам.
+        invalidate_all_feeds()
+        self.stdout.write(f'Пересобрано сводок авторов: {rebuilt}.')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import invalidate_all_feeds
+from posts.stats import rebuild_group_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает сводки групп (число постов, последняя активность, '
+        'последние посты) по таблице постов.'
+    )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_group_summaries()
+        # Каталог групп в кэше лент собран по старым сводкам.
+        invalidate_all_feeds()
+        self.stdout.write(f'Пересобрано сводок групп: {rebuilt}.')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.search import install_fts, rebuild_fts
+
+
+class Command(BaseCommand):
+    help = 'Создаёт и перестраивает полнотекстовый индекс постов (FTS5).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if not install_fts(options['database']):
+            raise CommandError('FTS5 доступен только для SQLite с FTS5.')
+        rebuild_fts(options['database'])
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
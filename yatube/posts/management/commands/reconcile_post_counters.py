@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import invalidate_all_feeds
+from posts.stats import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп.'
+
+    def handle(self, *args, **options):
+        fixed = reconcile_counters()
+        if fixed['authors'] or fixed['groups']:
+            # Счётчики выводятся в профилях и каталоге групп.
+            invalidate_all_feeds()
+        self.stdout.write(
+            f'Исправлено счётчиков: авторов — {fixed["authors"]}, '
+            f'групп — {fixed["groups"]}.'
+        )
@@ -0,0 +1,140 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from posts.bulk import bulk_insert_posts
+from posts.cache import invalidate_all_feeds
+from posts.models import Group, Post
+from posts.stats import rebuild_author_summaries, rebuild_group_summaries
+
+User = get_user_model()
+TEXT_POOL_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = 'Генерирует пользователей, группы и посты для нагрузочных тестов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько последних дней распределить даты постов.',
+        )
+        parser.add_argument(
+            '--no-group-share', type=float, default=0.3,
+            help='Доля постов без группы.',
+        )
+        parser.add_argument(
+            '--prefix', default='seed',
+            help='Префикс имён пользователей и слагов групп.',
+        )
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
+
+        author_ids = self.create_users(options['users'], options['prefix'])
+        group_ids = self.create_groups(options['groups'], options['prefix'])
+        if options['posts'] and not author_ids:
+            raise CommandError('Посты некому писать: задайте --users.')
+        self.create_posts(
+            options['posts'], author_ids, group_ids,
+            options['days'], options['no_group_share'],
+        )
+        rebuild_author_summaries()
+        rebuild_group_summaries()
+        invalidate_all_feeds()
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.monotonic() - started:.1f} с.'
+        ))
+
+    def batches(self, objects):
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def bulk_create(self, model, objects, total, insert=None):
+        insert = insert or model.objects.bulk_create
+        created = 0
+        for batch in self.batches(objects):
+            with transaction.atomic():
+                insert(batch)
+            created += len(batch)
+            self.stdout.write(
+                f'{model.__name__}: {created}/{total}', ending='\r'
+            )
+        self.stdout.write('')
+
+    def create_users(self, count, prefix):
+        password = make_password(None)
+        users = (
+            User(
+                username=f'{prefix}_user{num}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                email=f'{prefix}_user{num}@example.com',
+                password=password,
+            )
+            for num in range(count)
+        )
+        self.bulk_create(User, users, count)
+        return list(User.objects.filter(
+            username__startswith=f'{prefix}_user'
+        ).values_list('pk', flat=True))
+
+    def create_groups(self, count, prefix):
+        groups = (
+            Group(
+                title=self.faker.catch_phrase()[:200],
+                slug=f'{prefix}-group-{num}',
+                description=self.faker.paragraph(),
+            )
+            for num in range(count)
+        )
+        self.bulk_create(Group, groups, count)
+        return list(Group.objects.filter(
+            slug__startswith=f'{prefix}-group-'
+        ).values_list('pk', flat=True))
+
+    def create_posts(self, count, author_ids, group_ids, days, no_group):
+        # Faker медленный: на миллион постов берём тексты из готового пула.
+        texts = [
+            self.faker.paragraph(nb_sentences=self.random.randint(1, 8))
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        now = timezone.now()
+        span = timedelta(days=days).total_seconds()
+        choice = self.random.choice
+
+        def posts():
+            for _ in range(count):
+                has_group = group_ids and self.random.random() >= no_group
+                yield Post(
+                    text=choice(texts),
+                    author_id=choice(author_ids),
+                    group_id=choice(group_ids) if has_group else None,
+                    pub_date=now - timedelta(
+                        seconds=self.random.random() * span
+                    ),
+                )
+
+        self.bulk_create(Post, posts(), count, insert=bulk_insert_posts)
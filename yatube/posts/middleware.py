@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+from .cache import (anonymous_feed_etag, cached_page, page_cache_enabled,
+                    page_key)
+
+
+class AnonymousFeedMiddleware:
+    """Отдаёт анонимам ленты из кэша раньше сессий и аутентификации.
+
+    Запрос без cookie сессии заведомо анонимный: страницу ленты можно
+    взять из кэша (или ответить 304), не создавая ни request.session,
+    ни request.user. Стоит выше SessionMiddleware; промах кэша идёт
+    обычным путём через @cache_feed и заодно наполняет кэш.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = None
+        if (request.method == 'GET'
+                and settings.SESSION_COOKIE_NAME not in request.COOKIES
+                and page_cache_enabled()):
+            response = self.cached_feed(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    def cached_feed(self, request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        feed_func = getattr(match.func, 'feed_func', None)
+        if feed_func is None:
+            return None
+        feed = feed_func(*match.args, **match.kwargs)
+        # 304 — только на страницу, которая есть в кэше: иначе
+        # If-None-Match: * совпал бы и с ещё не отрендеренной.
+        response = cached_page(page_key(feed, request))
+        if response is None:
+            return None
+        etag = anonymous_feed_etag(feed, request)
+        if etag is not None:
+            etag = quote_etag(etag)
+            response = get_conditional_response(
+                request, etag=etag, response=response
+            )
+            response['ETag'] = etag
+        # Вошедшему та же страница выглядит иначе: общие кэши
+        # не должны отдавать ему копию анонима.
+        patch_vary_headers(response, ('Cookie',))
+        # Для меток MetricsMiddleware, как после обычного resolve.
+        request.resolver_match = match
+        return response
@@ -0,0 +1,51 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:24
+
+from django.db import migrations, models
+import posts.fields
+
+LATEST_POSTS = 10
+
+
+def fill_summaries(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    AuthorStats = apps.get_model('posts', 'AuthorStats')
+    for stats in AuthorStats.objects.all():
+        latest = list(
+            Post.objects.filter(author_id=stats.author_id).order_by(
+                '-pub_date', '-pk'
+            ).values_list('pk', 'pub_date')[:LATEST_POSTS]
+        )
+        stats.latest_post_ids = [pk for pk, _ in latest]
+        stats.last_post_date = latest[0][1] if latest else None
+        stats.groups = list(
+            Group.objects.filter(posts__author_id=stats.author_id).distinct()
+            .order_by('title', 'pk').values('id', 'slug', 'title')
+        )
+        stats.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authorstats',
+            name='groups',
+            field=posts.fields.JSONTextField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='authorstats',
+            name='last_post_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='authorstats',
+            name='latest_post_ids',
+            field=posts.fields.JSONTextField(blank=True, default=list),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
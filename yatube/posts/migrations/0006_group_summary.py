@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:26
+
+from django.db import migrations, models
+import posts.fields
+
+RECENT_POSTS = 3
+
+
+def fill_summaries(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    for group_id in Group.objects.values_list('pk', flat=True):
+        posts = Post.objects.filter(group_id=group_id)
+        latest = list(
+            posts.order_by('-pub_date', '-pk').values_list(
+                'pk', 'pub_date'
+            )[:RECENT_POSTS]
+        )
+        GroupStats.objects.update_or_create(group_id=group_id, defaults={
+            'post_count': posts.count(),
+            'last_activity': latest[0][1] if latest else None,
+            'recent_post_ids': [pk for pk, _ in latest],
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_author_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupstats',
+            name='last_activity',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='groupstats',
+            name='recent_post_ids',
+            field=posts.fields.JSONTextField(blank=True, default=list),
+        ),
+        migrations.AddIndex(
+            model_name='groupstats',
+            index=models.Index(fields=['-last_activity', '-group'], name='groupstats_activity_idx'),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
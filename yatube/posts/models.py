@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .fields import JSONTextField
+
 LINE_NUMBER = 15
 
 User = get_user_model()
@@ -31,7 +33,21 @@ class Post(models.Model):
     )
 
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:LINE_NUMBER]
@@ -44,3 +60,54 @@ class Group(models.Model):
 
     def __str__(self):
         return self.title[:LINE_NUMBER]
+
+
+class AuthorStats(models.Model):
+    """Сводка автора для шапки профиля, поддерживается сигналами.
+
+    groups — [{'id', 'slug', 'title'}] групп, где автор писал;
+    latest_post_ids — id последних постов в порядке ленты.
+    """
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='post_stats',
+        primary_key=True,
+    )
+    post_count = models.PositiveIntegerField(default=0)
+    last_post_date = models.DateTimeField(null=True, blank=True)
+    groups = JSONTextField(default=list, blank=True)
+    latest_post_ids = JSONTextField(default=list, blank=True)
+
+    def __str__(self):
+        return f'{self.author}: {self.post_count}'
+
+
+class GroupStats(models.Model):
+    """Сводка группы для каталога групп, поддерживается сигналами.
+
+    Строка есть у каждой группы; recent_post_ids — id последних постов
+    в порядке ленты.
+    """
+
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        primary_key=True,
+    )
+    post_count = models.PositiveIntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    recent_post_ids = JSONTextField(default=list, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-last_activity', '-group'],
+                name='groupstats_activity_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.group}: {self.post_count}'
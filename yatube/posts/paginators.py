@@ -0,0 +1,134 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = getattr(settings, 'EXACT_COUNT_LIMIT', 1000)
+
+
+def encode_cursor(post):
+    """Кодирует позицию поста в ленте в строку для ссылки."""
+    raw = f'{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (pub_date, pk) или None для битого курсора."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+class KeysetPage(Page):
+    """Страница ленты, построенная по курсору, а не по номеру."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        super().__init__(object_list, None, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Keyset page>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def next_cursor(self):
+        if not self.object_list:
+            return None
+        return encode_cursor(self.object_list[-1])
+
+    def previous_cursor(self):
+        if not self.object_list:
+            return None
+        return encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator(Paginator):
+    """Пагинатор по ключу (pub_date, id).
+
+    Не выполняет COUNT(*) и OFFSET: каждая страница — это один запрос
+    с условием по курсору и LIMIT, поэтому стоимость не растёт с глубиной.
+    """
+
+    ordering = ('-pub_date', '-pk')
+
+    def __init__(self, object_list, per_page, **kwargs):
+        super().__init__(
+            object_list.order_by(*self.ordering), per_page, **kwargs
+        )
+
+    def page_from_cursor(self, after=None, before=None):
+        """Возвращает страницу после курсора `after` или перед `before`.
+
+        Битый или пустой курсор означает первую страницу.
+        """
+        after = decode_cursor(after) if after else None
+        before = decode_cursor(before) if before else None
+        if before is not None:
+            return self._page_before(*before)
+        queryset = self.object_list
+        if after is not None:
+            pub_date, pk = after
+            queryset = queryset.filter(pub_date__lte=pub_date).filter(
+                Q(pub_date__lt=pub_date) | Q(pk__lt=pk)
+            )
+        posts = list(queryset[:self.per_page + 1])
+        return KeysetPage(
+            posts[:self.per_page],
+            self,
+            has_next=len(posts) > self.per_page,
+            has_previous=after is not None,
+        )
+
+    def _page_before(self, pub_date, pk):
+        queryset = self.object_list.filter(pub_date__gte=pub_date).filter(
+            Q(pub_date__gt=pub_date) | Q(pk__gt=pk)
+        ).reverse()
+        posts = list(queryset[:self.per_page + 1])
+        has_previous = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        posts.reverse()
+        return KeysetPage(
+            posts, self, has_next=True, has_previous=has_previous
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, который берёт число объектов из счётчика, а не COUNT(*).
+
+    estimate — число или функция без аргументов (счётчик из posts.stats).
+    Если оценка меньше exact_below, объекты всё же считаются точно:
+    на маленьких лентах COUNT(*) дешёвый, а погрешность заметна.
+    """
+
+    def __init__(self, object_list, per_page, estimate,
+                 exact_below=EXACT_COUNT_LIMIT, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.estimate = estimate
+        self.exact_below = exact_below
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate() if callable(self.estimate) else (
+            self.estimate
+        )
+        if estimate is None or estimate < self.exact_below:
+            return super().count
+        return estimate
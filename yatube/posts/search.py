@@ -0,0 +1,182 @@
+import base64
+import binascii
+import logging
+
+from django.db import connection, connections
+from django.db.utils import OperationalError
+
+from .models import Post
+from .paginators import KeysetPage, KeysetPaginator
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'posts_post_fts'
+
+# Внешний контент: FTS5 хранит только индекс, текст лежит в posts_post.
+# Триггеры держат индекс в синхронизации при любых записях, включая
+# bulk_create и импорт, где сигналы Django не срабатывают.
+FTS_SCHEMA = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text, content='posts_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+        AFTER INSERT ON posts_post BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+        AFTER DELETE ON posts_post BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF text ON posts_post BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+            VALUES ('delete', old.id, old.text);
+            INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+)
+FTS_TRIGGERS = {f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au'}
+
+
+def _existing_objects(cursor):
+    cursor.execute(
+        'SELECT name FROM sqlite_master WHERE name LIKE %s',
+        [f'{FTS_TABLE}%'],
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def install_fts(using='default'):
+    """Создаёт FTS-таблицу и триггеры, если их ещё нет.
+
+    Вызывается после каждой миграции: SQLite пересоздаёт posts_post при
+    изменении схемы и теряет триггеры, поэтому в этом случае индекс
+    перестраивается заново. Возвращает False, если FTS5 недоступен.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return False
+    try:
+        with db.cursor() as cursor:
+            existing = _existing_objects(cursor)
+            for statement in FTS_SCHEMA:
+                cursor.execute(statement)
+            if not FTS_TRIGGERS <= existing:
+                rebuild_fts(using)
+    except OperationalError as error:
+        logger.warning('Полнотекстовый поиск недоступен: %s', error)
+        return False
+    return True
+
+
+def rebuild_fts(using='default'):
+    """Перестраивает индекс целиком по содержимому posts_post."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def fts_available():
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        return FTS_TABLE in _existing_objects(cursor)
+
+
+def match_expression(query):
+    """Превращает ввод пользователя в выражение MATCH из фраз в кавычках.
+
+    Так операторы FTS5 (AND, NEAR, * и т.п.) в запросе не ломают разбор.
+    """
+    terms = query.split()
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def encode_rank_cursor(rank, pk):
+    raw = f'{rank!r}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_rank_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        rank, pk = raw.split('|')
+        return float(rank), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+
+class SearchPage(KeysetPage):
+    """Страница результатов поиска; курсор — пара (ранг, id)."""
+
+    def __init__(self, object_list, ranks, has_next, has_previous):
+        super().__init__(object_list, None, has_next, has_previous)
+        self.ranks = ranks
+
+    def next_cursor(self):
+        if not self.object_list:
+            return None
+        return encode_rank_cursor(self.ranks[-1], self.object_list[-1].pk)
+
+    def previous_cursor(self):
+        return None
+
+
+def _ranked_ids(match, limit, after):
+    sql = (
+        f'SELECT rowid, rank FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s'
+    )
+    params = [match]
+    if after is not None:
+        sql += ' AND (rank > %s OR (rank = %s AND rowid < %s))'
+        params += [after[0], after[0], after[1]]
+    sql += ' ORDER BY rank, rowid DESC LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def search_posts(query, per_page, after=None):
+    """Страница найденных постов, самые релевантные — первыми.
+
+    Без FTS5 (не SQLite) поиск откатывается на LIKE по тексту
+    с обычной пагинацией по дате.
+    """
+    if not fts_available():
+        paginator = KeysetPaginator(
+            Post.objects.filter(text__icontains=query).select_related(
+                'author', 'group'
+            ),
+            per_page,
+        )
+        return paginator.page_from_cursor(after=after)
+    cursor = decode_rank_cursor(after) if after else None
+    rows = _ranked_ids(match_expression(query), per_page + 1, cursor)
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        [pk for pk, _ in rows]
+    )
+    found = [(posts[pk], rank) for pk, rank in rows if pk in posts]
+    return SearchPage(
+        [post for post, _ in found],
+        [rank for _, rank in found],
+        has_next=has_next,
+        has_previous=cursor is not None,
+    )
+
+
+def search_ids_sql(query):
+    """Подзапрос с id найденных постов — для фильтрации queryset."""
+    return (
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        [match_expression(query)],
+    )
+
+
+def install_fts_after_migrate(sender, using, **kwargs):
+    install_fts(using)
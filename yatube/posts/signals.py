@@ -0,0 +1,148 @@
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .cache import (group_feed, group_index_feed, index_feed,
+                    invalidate_feeds, post_feed, profile_feed)
+from .models import AuthorStats, Group, GroupStats, Post, User
+from .stats import (add_author_post, add_group_post, refresh_author_groups,
+                    refresh_author_summary, refresh_group_summary)
+from .thumbnails import schedule_thumbnails
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_relations(sender, instance, **kwargs):
+    """Запоминает группу и автора поста до сохранения.
+
+    Их ленты и сводки тоже надо обновить, если пост перенесли.
+    """
+    instance._previous_group_id = None
+    instance._previous_author_id = None
+    if instance.pk is not None:
+        instance._previous_group_id, instance._previous_author_id = (
+            Post.objects.filter(pk=instance.pk).values_list(
+                'group_id', 'author_id'
+            ).first() or (None, None)
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    group_ids = {
+        instance.group_id, getattr(instance, '_previous_group_id', None)
+    } - {None}
+    slugs = Group.objects.filter(pk__in=group_ids).values_list(
+        'slug', flat=True
+    ) if group_ids else []
+    author_ids = {
+        instance.author_id, getattr(instance, '_previous_author_id', None)
+    } - {None}
+    usernames = User.objects.filter(pk__in=author_ids).values_list(
+        'username', flat=True
+    )
+    invalidate_feeds(
+        index_feed(),
+        group_index_feed(),
+        post_feed(instance.pk),
+        *(profile_feed(username) for username in usernames),
+        *(group_feed(slug) for slug in slugs),
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_counters_on_save(sender, instance, created, **kwargs):
+    if created:
+        add_author_post(instance)
+        add_group_post(instance)
+        return
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    if previous_author_id not in (None, instance.author_id):
+        # Пост сменил автора: пересчитать сводки обоих, включая группы.
+        refresh_author_summary(previous_author_id)
+        refresh_author_summary(instance.author_id, create=True)
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if previous_group_id != instance.group_id:
+        refresh_group_summary(previous_group_id)
+        refresh_group_summary(instance.group_id, create=True)
+        refresh_author_groups([instance.author_id])
+
+
+@receiver(post_save, sender=Post)
+def pregenerate_thumbnails(sender, instance, **kwargs):
+    schedule_thumbnails(instance)
+
+
+@receiver(post_delete, sender=Post)
+def update_counters_on_delete(sender, instance, **kwargs):
+    # Удаление редкое, а пост мог быть среди последних или последним
+    # в группе: сводку автора проще пересчитать.
+    refresh_author_summary(instance.author_id)
+    refresh_group_summary(instance.group_id)
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, **kwargs):
+    # Строка сводки есть до первого поста: посты только увеличивают
+    # счётчик, и параллельные первые посты не пересчитывают её наперегонки.
+    if created:
+        AuthorStats.objects.get_or_create(author=instance)
+
+
+@receiver(pre_save, sender=Group)
+def remember_previous_slug(sender, instance, **kwargs):
+    instance._previous_slug = None
+    if instance.pk is not None:
+        instance._previous_slug = Group.objects.filter(
+            pk=instance.pk
+        ).values_list('slug', flat=True).first()
+
+
+def _group_related_feeds(group):
+    """Ленты, в которых выводятся ссылки на группу."""
+    usernames = User.objects.filter(posts__group=group).values_list(
+        'username', flat=True
+    ).distinct()
+    return [
+        index_feed(),
+        group_index_feed(),
+        *(profile_feed(name) for name in usernames),
+    ]
+
+
+def _group_author_ids(group):
+    return list(
+        Post.objects.filter(group=group).order_by().values_list(
+            'author_id', flat=True
+        ).distinct()
+    )
+
+
+@receiver(post_save, sender=Group)
+def invalidate_group_feeds(sender, instance, created, **kwargs):
+    if created:
+        # Каталог групп показывает и группы без постов.
+        GroupStats.objects.get_or_create(group=instance)
+        invalidate_feeds(group_index_feed())
+        return
+    invalidate_feeds(
+        group_feed(instance.slug),
+        group_feed(instance._previous_slug),
+        *_group_related_feeds(instance),
+    )
+    # Название и slug группы хранятся в сводках авторов.
+    refresh_author_groups(_group_author_ids(instance))
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_deleted_group_feeds(sender, instance, **kwargs):
+    # pre_delete: после удаления у постов уже не будет ссылки на группу.
+    invalidate_feeds(
+        group_feed(instance.slug), *_group_related_feeds(instance)
+    )
+    instance._author_ids = _group_author_ids(instance)
+
+
+@receiver(post_delete, sender=Group)
+def drop_deleted_group_from_summaries(sender, instance, **kwargs):
+    refresh_author_groups(getattr(instance, '_author_ids', []))
@@ -0,0 +1,227 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from .models import AuthorStats, Group, GroupStats, Post
+
+TOTAL_COUNT_KEY = 'posts:total_count'
+TOTAL_COUNT_TIMEOUT = getattr(settings, 'TOTAL_COUNT_TIMEOUT', 60)
+# Сколько последних постов помнит сводка автора: не меньше страницы
+# профиля, чтобы первую страницу можно было собрать по id.
+AUTHOR_LATEST_POSTS = getattr(settings, 'AUTHOR_LATEST_POSTS', 10)
+# Сколько последних постов группы показывает каталог групп.
+GROUP_RECENT_POSTS = getattr(settings, 'GROUP_RECENT_POSTS', 3)
+
+
+def _sort_groups(groups):
+    return sorted(groups, key=lambda group: (group['title'], group['id']))
+
+
+def author_groups(author_id):
+    return _sort_groups(
+        Group.objects.filter(posts__author_id=author_id).distinct().values(
+            'id', 'slug', 'title'
+        )
+    )
+
+
+def _latest(posts, limit):
+    """(id последних limit постов, дата самого нового) в порядке ленты."""
+    latest = list(
+        posts.order_by('-pub_date', '-pk').values_list('pk', 'pub_date')[
+            :limit
+        ]
+    )
+    return [pk for pk, _ in latest], latest[0][1] if latest else None
+
+
+def author_summary(author_id):
+    """Сводка автора, посчитанная заново по его постам."""
+    posts = Post.objects.filter(author_id=author_id)
+    post_ids, last_post_date = _latest(posts, AUTHOR_LATEST_POSTS)
+    return {
+        'post_count': posts.count(),
+        'last_post_date': last_post_date,
+        'latest_post_ids': post_ids,
+        'groups': author_groups(author_id),
+    }
+
+
+def refresh_author_summary(author_id, create=False):
+    """Пересчитывает сводку автора целиком.
+
+    Без create отсутствующая строка не создаётся: при удалении
+    пользователя её уже удалил каскад, а посты удаляются после.
+    """
+    summary = author_summary(author_id)
+    if create:
+        AuthorStats.objects.update_or_create(
+            author_id=author_id, defaults=summary
+        )
+    else:
+        AuthorStats.objects.filter(author_id=author_id).update(**summary)
+
+
+def refresh_author_groups(author_ids):
+    """Обновляет список групп у авторов, например после переименования."""
+    for author_id in author_ids:
+        AuthorStats.objects.filter(author_id=author_id).update(
+            groups=author_groups(author_id)
+        )
+
+
+def add_author_post(post):
+    """Учитывает новый пост в сводке автора без COUNT(*) по его постам.
+
+    Счётчик растёт одним UPDATE … F(): чтение строки сводки и её запись
+    отдельными запросами на SQLite упираются в "database is locked",
+    а между ними теряются параллельные посты. Последние посты и группы
+    читаются заново. Если строки нет, сводка пересчитывается целиком.
+    """
+    post_ids, last_post_date = _latest(
+        Post.objects.filter(author_id=post.author_id), AUTHOR_LATEST_POSTS
+    )
+    summary = {
+        'post_count': F('post_count') + 1,
+        'last_post_date': last_post_date,
+        'latest_post_ids': post_ids,
+    }
+    if post.group_id is not None:
+        summary['groups'] = author_groups(post.author_id)
+    if not AuthorStats.objects.filter(author_id=post.author_id).update(
+        **summary
+    ):
+        refresh_author_summary(post.author_id, create=True)
+
+
+def group_summary(group_id):
+    """Сводка группы, посчитанная заново по её постам."""
+    posts = Post.objects.filter(group_id=group_id)
+    post_ids, last_activity = _latest(posts, GROUP_RECENT_POSTS)
+    return {
+        'post_count': posts.count(),
+        'last_activity': last_activity,
+        'recent_post_ids': post_ids,
+    }
+
+
+def refresh_group_summary(group_id, create=False):
+    """Пересчитывает сводку группы; create — как у refresh_author_summary."""
+    if group_id is None:
+        return
+    summary = group_summary(group_id)
+    if create:
+        GroupStats.objects.update_or_create(
+            group_id=group_id, defaults=summary
+        )
+    else:
+        GroupStats.objects.filter(group_id=group_id).update(**summary)
+
+
+def add_group_post(post):
+    """Учитывает новый пост в сводке его группы, как add_author_post."""
+    if post.group_id is None:
+        return
+    post_ids, last_activity = _latest(
+        Post.objects.filter(group_id=post.group_id), GROUP_RECENT_POSTS
+    )
+    if not GroupStats.objects.filter(group_id=post.group_id).update(
+        post_count=F('post_count') + 1,
+        last_activity=last_activity,
+        recent_post_ids=post_ids,
+    ):
+        refresh_group_summary(post.group_id, create=True)
+
+
+def rebuild_group_summaries():
+    """Пересобирает сводки всех групп; возвращает их число."""
+    group_ids = list(Group.objects.values_list('pk', flat=True))
+    for group_id in group_ids:
+        with transaction.atomic():
+            refresh_group_summary(group_id, create=True)
+    return len(group_ids)
+
+
+def get_author_summary(username):
+    """Сводка автора вместе с самим автором — один запрос.
+
+    None, если у пользователя ещё нет сводки (или его нет вовсе).
+    """
+    return AuthorStats.objects.select_related('author').filter(
+        author__username=username
+    ).first()
+
+
+def rebuild_author_summaries():
+    """Пересобирает сводки всех авторов; возвращает их число."""
+    author_ids = set(AuthorStats.objects.values_list('author_id', flat=True))
+    author_ids |= set(
+        Post.objects.order_by().values_list('author_id', flat=True).distinct()
+    )
+    for author_id in author_ids:
+        with transaction.atomic():
+            refresh_author_summary(author_id, create=True)
+    return len(author_ids)
+
+
+def get_author_post_count(author):
+    return AuthorStats.objects.filter(author=author).values_list(
+        'post_count', flat=True
+    ).first() or 0
+
+
+def get_group_post_count(group):
+    return GroupStats.objects.filter(group=group).values_list(
+        'post_count', flat=True
+    ).first() or 0
+
+
+def get_total_post_count():
+    """Оценка числа всех постов: сумма счётчиков авторов в кэше с TTL.
+
+    Между пересчётами оценка может отставать на TOTAL_COUNT_TIMEOUT.
+    """
+    total = cache.get(TOTAL_COUNT_KEY)
+    if total is None:
+        total = AuthorStats.objects.aggregate(
+            total=Sum('post_count')
+        )['total'] or 0
+        cache.set(TOTAL_COUNT_KEY, total, TOTAL_COUNT_TIMEOUT)
+    return total
+
+
+def _reconcile(model, field, counted, refresh):
+    """Приводит счётчики model к точным значениям counted.
+
+    Разошедшаяся или пропавшая строка пересчитывается refresh целиком:
+    раз счётчик отстал, отстали и остальные поля сводки.
+    Возвращает число исправленных строк.
+    """
+    stored = dict(model.objects.values_list(field, 'post_count'))
+    fixed = 0
+    for pk in stored.keys() | counted.keys():
+        if pk not in stored or stored[pk] != counted.get(pk, 0):
+            refresh(pk, create=True)
+            fixed += 1
+    return fixed
+
+
+def reconcile_counters():
+    """Пересчитывает все счётчики постов; возвращает число исправлений."""
+    by_author = dict(
+        Post.objects.order_by().values_list('author').annotate(Count('pk'))
+    )
+    by_group = dict(
+        Post.objects.filter(group__isnull=False).order_by().values_list(
+            'group'
+        ).annotate(Count('pk'))
+    )
+    return {
+        'authors': _reconcile(
+            AuthorStats, 'author_id', by_author, refresh_author_summary
+        ),
+        'groups': _reconcile(
+            GroupStats, 'group_id', by_group, refresh_group_summary
+        ),
+    }
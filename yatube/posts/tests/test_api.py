@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.api import MAX_LIMIT
+from posts.models import Group, Post
+
+User = get_user_model()
+POSTS_COUNT = 25
+
+
+class PostApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='api_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='api-group',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(
+                author=cls.user,
+                text=f'Пост {num}',
+                group=cls.group if num % 2 else None,
+            )
+            for num in range(POSTS_COUNT)
+        )
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_list_single_query_and_cursor(self):
+        url = reverse('posts:api_index')
+        with self.assertNumQueries(1):
+            first = self.client.get(url, {'limit': 20}).json()
+        self.assertEqual(len(first['results']), 20)
+        self.assertIsNone(first['previous'])
+        second = self.client.get(
+            url, {'limit': 20, 'after': first['next']}
+        ).json()
+        self.assertIsNone(second['next'])
+        ids = [post['id'] for post in first['results'] + second['results']]
+        self.assertEqual(
+            ids,
+            list(Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )),
+        )
+
+    def test_sparse_fields(self):
+        response = self.client.get(
+            reverse('posts:api_post', args=(self.post.pk,)),
+            {'fields': 'id,author'},
+        )
+        self.assertEqual(
+            response.json(), {'id': self.post.pk, 'author': 'api_author'}
+        )
+        response = self.client.get(
+            reverse('posts:api_index'), {'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_group_and_profile(self):
+        group = self.client.get(
+            reverse('posts:api_group', args=(self.group.slug,)),
+            {'limit': POSTS_COUNT},
+        ).json()
+        self.assertEqual(
+            {post['group'] for post in group['results']}, {self.group.slug}
+        )
+        self.assertEqual(len(group['results']), self.group.posts.count())
+        profile = self.client.get(
+            reverse('posts:api_profile', args=(self.user.username,)),
+            {'fields': 'author'},
+        ).json()
+        self.assertEqual(
+            {post['author'] for post in profile['results']},
+            {self.user.username},
+        )
+
+    def test_not_found(self):
+        urls = (
+            reverse('posts:api_group', args=('missing',)),
+            reverse('posts:api_profile', args=('missing',)),
+            reverse('posts:api_post', args=(0,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_max_page_single_query(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Ещё пост {num}', group=self.group)
+            for num in range(MAX_LIMIT)
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('posts:api_index'), {'limit': MAX_LIMIT + 1}
+            )
+        self.assertEqual(len(response.json()['results']), MAX_LIMIT)
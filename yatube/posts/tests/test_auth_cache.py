@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.auth import StaleUserCache
+from posts.tests.utils import SessionCacheTestCase
+
+User = get_user_model()
+
+
+@override_settings(AUTH_USER_CACHE_VERIFY=False)
+class CachedUserTest(SessionCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username='cached-user', password='old-password'
+        )
+        self.client = Client()
+        self.client.login(username='cached-user', password='old-password')
+        self.url = reverse('posts:about:author')
+
+    def get_user(self, client=None):
+        response = (client or self.client).get(self.url)
+        return response.wsgi_request.user
+
+    def test_steady_state_makes_no_user_queries(self):
+        self.get_user()
+        with self.assertNumQueries(0):
+            user = self.get_user()
+        self.assertEqual(user, self.user)
+
+    def test_password_change_logs_out(self):
+        self.get_user()
+        self.user.set_password('new-password')
+        self.user.save()
+        self.assertFalse(self.get_user().is_authenticated)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.get_user()
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self.get_user().is_authenticated)
+
+    def test_saved_changes_are_visible(self):
+        self.get_user()
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        self.assertEqual(self.get_user().first_name, 'Новое имя')
+
+    def test_logout_drops_cached_user(self):
+        other = Client()
+        other.login(username='cached-user', password='old-password')
+        self.get_user(other)
+        self.client.logout()
+        self.assertFalse(self.get_user().is_authenticated)
+        with self.assertNumQueries(1):
+            self.assertTrue(self.get_user(other).is_authenticated)
+
+    def test_verify_mode_catches_stale_cache(self):
+        self.get_user()
+        # update() не шлёт post_save: кэш остаётся устаревшим.
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with override_settings(AUTH_USER_CACHE_VERIFY=True):
+            with self.assertRaises(StaleUserCache):
+                self.get_user()
+
+
+@override_settings(AUTH_USER_CACHE_VERIFY=False)
+class PerProcessCacheUserTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='uncached-user')
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:about:author')
+
+    def test_deactivated_by_update_is_refused(self):
+        self.assertTrue(
+            self.client.get(self.url).wsgi_request.user.is_authenticated
+        )
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertFalse(
+            self.client.get(self.url).wsgi_request.user.is_authenticated
+        )
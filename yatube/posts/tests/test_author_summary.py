@@ -0,0 +1,140 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class AuthorSummaryTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='summarized')
+        cls.group = Group.objects.create(
+            title='Бета', slug='beta', description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Альфа', slug='alpha', description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def create_post(self, group=None):
+        return Post.objects.create(
+            author=self.user, text='Тестовый пост', group=group
+        )
+
+    def summary(self):
+        return AuthorStats.objects.get(author=self.user)
+
+    def test_new_posts_update_summary(self):
+        first = self.create_post(self.group)
+        second = self.create_post(self.other_group)
+        third = self.create_post(self.group)
+        summary = self.summary()
+        self.assertEqual(summary.post_count, 3)
+        self.assertEqual(summary.last_post_date, third.pub_date)
+        self.assertEqual(
+            summary.latest_post_ids, [third.pk, second.pk, first.pk]
+        )
+        self.assertEqual(
+            [group['slug'] for group in summary.groups], ['alpha', 'beta']
+        )
+
+    def test_new_post_increments_stored_count(self):
+        self.assertEqual(self.summary().post_count, 0)
+        # Пост другого потока, уже учтённый в счётчике.
+        AuthorStats.objects.filter(author=self.user).update(post_count=5)
+        self.create_post()
+        self.assertEqual(self.summary().post_count, 6)
+
+    def test_latest_post_ids_are_capped(self):
+        posts = [self.create_post() for _ in range(12)]
+        self.assertEqual(
+            self.summary().latest_post_ids,
+            [post.pk for post in reversed(posts)][:10],
+        )
+
+    def test_delete_and_group_change_refresh_summary(self):
+        first = self.create_post(self.group)
+        second = self.create_post(self.other_group)
+        second.delete()
+        summary = self.summary()
+        self.assertEqual(summary.post_count, 1)
+        self.assertEqual(summary.latest_post_ids, [first.pk])
+        self.assertEqual(summary.last_post_date, first.pub_date)
+        first.group = self.other_group
+        first.save()
+        self.assertEqual(
+            [group['slug'] for group in self.summary().groups], ['alpha']
+        )
+
+    def test_group_rename_and_delete(self):
+        group = Group.objects.create(
+            title='Гамма', slug='gamma', description='Тестовое описание',
+        )
+        self.create_post(group)
+        group.title = 'Дельта'
+        group.save()
+        self.assertEqual(self.summary().groups[0]['title'], 'Дельта')
+        group.delete()
+        self.assertEqual(self.summary().groups, [])
+
+    def test_profile_renders_from_summary(self):
+        posts = [self.create_post(self.group) for _ in range(12)]
+        url = reverse('posts:profile', args=(self.user.username,))
+        # Сводка с автором и первая страница по id.
+        with self.assertNumQueries(2):
+            response = Client().get(url)
+        page = response.context['page_obj']
+        self.assertEqual(
+            list(page), list(reversed(posts))[:len(page)]
+        )
+        self.assertTrue(page.has_next())
+        self.assertEqual(response.context['post_count'], 12)
+        self.assertContains(response, self.group.title)
+
+    def test_author_change_refreshes_both_summaries(self):
+        post = self.create_post(self.group)
+        other = User.objects.create_user(username='new-author')
+        post.author = other
+        post.save()
+        summary = self.summary()
+        self.assertEqual(summary.post_count, 0)
+        self.assertEqual(summary.latest_post_ids, [])
+        self.assertEqual(summary.groups, [])
+        other_summary = AuthorStats.objects.get(author=other)
+        self.assertEqual(other_summary.post_count, 1)
+        self.assertEqual(other_summary.latest_post_ids, [post.pk])
+        self.assertEqual(other_summary.groups[0]['slug'], self.group.slug)
+
+    def test_profile_ignores_summary_after_update(self):
+        posts = [self.create_post() for _ in range(12)]
+        other = User.objects.create_user(username='update-author')
+        # update() не шлёт сигналов: сводка помнит ушедший пост.
+        Post.objects.filter(pk=posts[-1].pk).update(author=other)
+        response = Client().get(
+            reverse('posts:profile', args=(self.user.username,))
+        )
+        page = response.context['page_obj']
+        self.assertEqual(list(page), list(reversed(posts[:-1]))[:10])
+        self.assertTrue(page.has_next())
+
+    def test_rebuild_command_backfills_summaries(self):
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Импорт', group=self.group)
+            for _ in range(3)
+        ])
+        self.assertEqual(self.summary().post_count, 0)
+        call_command('rebuild_author_summaries', stdout=StringIO())
+        summary = self.summary()
+        self.assertEqual(summary.post_count, 3)
+        self.assertEqual(len(summary.latest_post_ids), 3)
+        self.assertEqual(summary.groups[0]['slug'], self.group.slug)
@@ -0,0 +1,108 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.cache import feed_cache_stats
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(FEED_PAGE_CACHE=True)
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cached')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='cached-group',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Первый пост', group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse(
+                'posts:group_list', kwargs={'slug': self.group.slug}
+            ),
+            'other_group': reverse(
+                'posts:group_list', kwargs={'slug': self.other_group.slug}
+            ),
+            'profile': reverse(
+                'posts:profile', kwargs={'username': self.user.username}
+            ),
+        }
+
+    def warm_up(self):
+        for url in self.urls.values():
+            self.guest_client.get(url)
+
+    def is_cached(self, url):
+        return self.guest_client.get(url).context is None
+
+    def test_anonymous_feed_is_cached(self):
+        first = self.guest_client.get(self.urls['index'])
+        second = self.guest_client.get(self.urls['index'])
+        self.assertIsNotNone(first.context)
+        self.assertIsNone(second.context)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(feed_cache_stats(), {'hits': 1, 'misses': 1})
+
+    @override_settings(FEED_PAGE_CACHE=None)
+    def test_no_page_cache_with_per_process_cache(self):
+        self.guest_client.get(self.urls['index'])
+        self.assertFalse(self.is_cached(self.urls['index']))
+        with self.assertRaises(CommandError):
+            call_command('feed_cache_stats', stdout=StringIO())
+
+    def test_authorized_feed_is_not_cached(self):
+        client = Client()
+        client.force_login(self.user)
+        client.get(self.urls['index'])
+        self.assertIsNotNone(client.get(self.urls['index']).context)
+
+    def test_new_post_invalidates_only_affected_feeds(self):
+        self.warm_up()
+        Post.objects.create(author=self.user, text='Новый', group=self.group)
+        self.assertFalse(self.is_cached(self.urls['index']))
+        self.assertFalse(self.is_cached(self.urls['group']))
+        self.assertFalse(self.is_cached(self.urls['profile']))
+        self.assertTrue(self.is_cached(self.urls['other_group']))
+
+    def test_group_change_invalidates_both_groups(self):
+        self.warm_up()
+        self.post.group = self.other_group
+        self.post.save()
+        self.assertFalse(self.is_cached(self.urls['group']))
+        self.assertFalse(self.is_cached(self.urls['other_group']))
+
+    def test_post_delete_invalidates_feeds(self):
+        post = Post.objects.create(author=self.user, text='Удалить')
+        self.warm_up()
+        post.delete()
+        self.assertFalse(self.is_cached(self.urls['index']))
+        self.assertFalse(self.is_cached(self.urls['profile']))
+        self.assertTrue(self.is_cached(self.urls['group']))
+
+    def test_group_edit_invalidates_group_feed(self):
+        self.warm_up()
+        self.group.title = 'Новое название'
+        self.group.save()
+        response = self.guest_client.get(self.urls['group'])
+        self.assertContains(response, 'Новое название')
+        self.assertTrue(self.is_cached(self.urls['other_group']))
@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Group, Post
+from posts.stats import get_author_post_count
+
+User = get_user_model()
+
+
+class SeedAndBenchCommandsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command(
+            'seed_posts', users=5, groups=2, posts=60, batch_size=25,
+            seed=1, stdout=StringIO(),
+        )
+
+    def test_seed_posts_creates_data(self):
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertEqual(Post.objects.count(), 60)
+        self.assertGreater(
+            Post.objects.values('pub_date').distinct().count(), 1
+        )
+        author = User.objects.first()
+        self.assertEqual(
+            get_author_post_count(author), author.posts.count()
+        )
+
+    def test_bench_views_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'views.json')
+            call_command(
+                'bench_views', requests=2, depth=2, output=output,
+                seed=1, stdout=StringIO(),
+            )
+            with open(output, encoding='utf-8') as file:
+                report = json.load(file)
+        self.assertEqual(report['posts'], 60)
+        for name in ('index', 'profile ?page=2', 'post_detail (author)'):
+            with self.subTest(name=name):
+                result = report['results'][name]
+                self.assertEqual(result['latency_ms']['count'], 2)
+                self.assertIn('p99', result['latency_ms'])
+                self.assertIn('p50', result['queries'])
+        self.assertIn('api_index ?limit=200', report['results'])
+        serialization = report['results']['api serialize']
+        self.assertEqual(serialization['posts'], 60)
+        self.assertEqual(serialization['latency_ms']['count'], 2)
+
+    def test_bench_paginator_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'paginator.json')
+            call_command(
+                'bench_paginator', requests=2, output=output,
+                stdout=StringIO(),
+            )
+            with open(output, encoding='utf-8') as file:
+                report = json.load(file)
+        self.assertEqual(report['pages'], 6)
+        self.assertEqual(report['results']['full middle']['links'], 6)
+        self.assertEqual(report['results']['window last']['latency_ms'][
+            'count'
+        ], 2)
+
+    def test_bench_sessions_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'sessions.json')
+            call_command(
+                'bench_sessions', requests=4, output=output,
+                stdout=StringIO(),
+            )
+            with open(output, encoding='utf-8') as file:
+                report = json.load(file)
+        results = report['results']
+        self.assertEqual(results['db logged_in']['session_queries'], 4)
+        self.assertEqual(results['cache logged_in']['session_queries'], 0)
+        self.assertEqual(results['cache anonymous']['queries_per_request'], 0)
+
+
+class ImportPostsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='importer')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='import-group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_import_jsonl(self):
+        rows = [
+            {'text': 'Первый', 'author': 'importer', 'group': 'import-group',
+             'pub_date': '2020-01-01T10:00:00+00:00'},
+            {'text': 'Второй', 'author': 'importer'},
+            {'text': 'Чужой', 'author': 'nobody'},
+        ]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows)
+        )
+        call_command(
+            'import_posts', path, batch_size=2,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+        self.assertEqual(Post.objects.count(), 2)
+        post = Post.objects.get(text='Первый')
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(post.pub_date.year, 2020)
+        # Дата сохраняется без переключения auto_now_add у поля модели.
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+        self.assertEqual(get_author_post_count(self.user), 2)
+        self.assertFalse(os.path.exists(path + '.checkpoint'))
+
+    def test_import_skips_malformed_values(self):
+        rows = [
+            {'text': 'Нет даты', 'author': 'importer',
+             'pub_date': '2020-13-45T00:00:00'},
+            {'text': 'Число', 'author': 'importer', 'pub_date': 20200101},
+            {'text': 'Список', 'author': ['importer']},
+            {'text': 'Группы', 'author': 'importer', 'group': ['a', 'b']},
+            {'text': 'Годный', 'author': 'importer'},
+        ]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows)
+        )
+        stderr = StringIO()
+        call_command(
+            'import_posts', path, stdout=StringIO(), stderr=stderr,
+        )
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Годный']
+        )
+        self.assertEqual(len(stderr.getvalue().splitlines()), 4)
+
+    def test_import_csv_resumes_from_checkpoint(self):
+        path = self.write(
+            'posts.csv',
+            'text,author,group\n'
+            'Уже был,importer,\n'
+            'Новый,importer,import-group\n'
+        )
+        self.write('posts.csv.checkpoint', '1')
+        call_command(
+            'import_posts', path, resume=True, stdout=StringIO(),
+        )
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Новый']
+        )
+
+    def test_import_reports_rate_without_elapsed_time(self):
+        path = self.write('posts.jsonl', '')
+        with mock.patch(
+            'posts.management.commands.import_posts.time.monotonic',
+            return_value=100.0,
+        ):
+            call_command('import_posts', path, stdout=StringIO())
+        self.assertFalse(Post.objects.exists())
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts import views
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(FEED_ETAGS=True)
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='etagged')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='etag-group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'etagged'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def get_etag(self, url, client=None):
+        response = (client or self.guest_client).get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.has_header('ETag'))
+        return response['ETag']
+
+    def test_matching_etag_skips_render(self):
+        # Авторизованному клиенту кэш страниц не отдаётся, так что без
+        # валидаторов каждый запрос дошёл бы до render().
+        client = Client()
+        client.force_login(self.user)
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.get_etag(url, client)
+                with mock.patch.object(views, 'render') as render:
+                    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+                render.assert_not_called()
+
+    def test_post_write_changes_etag(self):
+        etags = {url: self.get_etag(url) for url in self.urls}
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Изменённый текст'
+        post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_depends_on_user_and_page(self):
+        url = reverse('posts:index')
+        etag = self.get_etag(url)
+        client = Client()
+        client.force_login(self.user)
+        self.assertNotEqual(client.get(url)['ETag'], etag)
+        self.assertNotEqual(
+            self.guest_client.get(url, {'page': 2})['ETag'], etag
+        )
+
+    @override_settings(FEED_ETAGS=None)
+    def test_no_etags_with_per_process_cache(self):
+        # Версии лент в locmem у каждого воркера свои: ETag не отдаётся.
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertFalse(response.has_header('ETag'))
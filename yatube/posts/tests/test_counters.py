@@ -0,0 +1,121 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import AuthorStats, Group, GroupStats, Post
+from posts.stats import get_author_post_count, get_group_post_count
+
+User = get_user_model()
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='counted')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='counted-group',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-counted-group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def create_post(self, group=None):
+        return Post.objects.create(
+            author=self.user, text='Тестовый пост', group=group
+        )
+
+    def test_create_and_delete_update_counters(self):
+        post = self.create_post(self.group)
+        self.create_post()
+        self.assertEqual(get_author_post_count(self.user), 2)
+        self.assertEqual(get_group_post_count(self.group), 1)
+        post.delete()
+        self.assertEqual(get_author_post_count(self.user), 1)
+        self.assertEqual(get_group_post_count(self.group), 0)
+
+    def test_new_post_increments_stored_group_count(self):
+        # Пост другого потока, уже учтённый в счётчике группы.
+        GroupStats.objects.filter(group=self.group).update(post_count=5)
+        post = self.create_post(self.group)
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 6)
+        self.assertEqual(stats.recent_post_ids, [post.pk])
+        self.assertEqual(stats.last_activity, post.pub_date)
+
+    def test_group_reassignment_moves_count(self):
+        post = self.create_post(self.group)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(get_group_post_count(self.group), 0)
+        self.assertEqual(get_group_post_count(self.other_group), 1)
+        post.group = None
+        post.save()
+        self.assertEqual(get_group_post_count(self.other_group), 0)
+        self.assertEqual(get_author_post_count(self.user), 1)
+
+    def test_reconcile_repairs_drift(self):
+        self.create_post(self.group)
+        self.create_post(self.group)
+        AuthorStats.objects.filter(author=self.user).update(post_count=7)
+        GroupStats.objects.filter(group=self.group).delete()
+        GroupStats.objects.filter(group=self.other_group).update(post_count=3)
+        call_command('reconcile_post_counters', stdout=StringIO())
+        self.assertEqual(get_author_post_count(self.user), 2)
+        self.assertEqual(get_group_post_count(self.group), 2)
+        self.assertEqual(get_group_post_count(self.other_group), 0)
+
+    def test_reconcile_rebuilds_missing_summaries(self):
+        first = self.create_post(self.group)
+        second = self.create_post(self.group)
+        AuthorStats.objects.filter(author=self.user).delete()
+        GroupStats.objects.filter(group=self.group).delete()
+        call_command('reconcile_post_counters', stdout=StringIO())
+        author = AuthorStats.objects.get(author=self.user)
+        self.assertEqual(author.post_count, 2)
+        self.assertEqual(author.latest_post_ids, [second.pk, first.pk])
+        self.assertEqual(author.last_post_date, second.pub_date)
+        self.assertEqual(author.groups[0]['slug'], self.group.slug)
+        group = GroupStats.objects.get(group=self.group)
+        self.assertEqual(group.recent_post_ids, [second.pk, first.pk])
+        self.assertEqual(group.last_activity, second.pub_date)
+
+    @override_settings(FEED_PAGE_CACHE=True)
+    def test_reconcile_resets_cached_pages(self):
+        self.create_post()
+        url = reverse('posts:profile', kwargs={'username': 'counted'})
+        client = Client()
+        client.get(url)
+        AuthorStats.objects.filter(author=self.user).update(post_count=7)
+        self.assertIsNone(client.get(url).context)
+        call_command('reconcile_post_counters', stdout=StringIO())
+        response = client.get(url)
+        self.assertIsNotNone(response.context)
+        self.assertEqual(response.context['post_count'], 1)
+
+    def test_views_read_counters(self):
+        post = self.create_post()
+        AuthorStats.objects.filter(author=self.user).update(post_count=42)
+        client = Client()
+        responses = (
+            client.get(
+                reverse('posts:profile', kwargs={'username': 'counted'})
+            ),
+            client.get(
+                reverse('posts:post_detail', kwargs={'post_id': post.pk})
+            ),
+        )
+        for response in responses:
+            with self.subTest(url=response.request['PATH_INFO']):
+                self.assertContains(response, '42')
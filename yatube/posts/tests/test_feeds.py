@@ -0,0 +1,111 @@
+from http import HTTPStatus
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+@override_settings(FEED_ETAGS=True)
+class SyndicationFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='syndicated')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='feed-group',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост <{num}> & ко', group=cls.group)
+            for num in range(5)
+        )
+        Post.objects.create(author=cls.user, text='Вне группы')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def get_xml(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        return response, ElementTree.fromstring(
+            b''.join(response.streaming_content)
+        )
+
+    def test_atom_feeds_follow_view_ordering(self):
+        feeds = {
+            reverse('posts:index_feed', args=('atom',)): Post.objects.all(),
+            reverse(
+                'posts:group_feed', args=(self.group.slug, 'atom')
+            ): self.group.posts.all(),
+            reverse(
+                'posts:profile_feed', args=(self.user.username, 'atom')
+            ): self.user.posts.all(),
+        }
+        for url, posts in feeds.items():
+            with self.subTest(url=url):
+                response, root = self.get_xml(url)
+                self.assertTrue(response['Content-Type'].startswith(
+                    'application/atom+xml'
+                ))
+                self.assertEqual(
+                    [entry.find(f'{ATOM}content').text
+                     for entry in root.iter(f'{ATOM}entry')],
+                    [post.text for post in posts.order_by('-pub_date', '-pk')],
+                )
+
+    def test_rss_feed(self):
+        response, root = self.get_xml(
+            reverse('posts:group_feed', args=(self.group.slug, 'rss'))
+        )
+        self.assertTrue(
+            response['Content-Type'].startswith('application/rss+xml')
+        )
+        self.assertEqual(len(root.findall('channel/item')), 5)
+        self.assertEqual(
+            root.find('channel/title').text, 'Yatube: Тестовая группа'
+        )
+
+    def test_unknown_kind(self):
+        response = self.client.get(reverse('posts:index_feed', args=('xml',)))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_conditional_get(self):
+        url = reverse('posts:index_feed', args=('atom',))
+        etag = self.client.get(url)['ETag']
+        self.assertNotEqual(
+            etag, self.client.get(
+                reverse('posts:index_feed', args=('rss',))
+            )['ETag']
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Post.objects.create(author=self.user, text='Свежий пост')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @mock.patch('posts.feeds.FEED_MAX_ITEMS', 3)
+    def test_feed_is_limited(self):
+        _, root = self.get_xml(reverse('posts:index_feed', args=('rss',)))
+        self.assertEqual(
+            [item.find('description').text
+             for item in root.findall('channel/item')],
+            [post.text for post in Post.objects.all()[:3]],
+        )
+
+    def test_control_characters_are_stripped(self):
+        Post.objects.create(author=self.user, text='Текст\x00 с\x1b мусором')
+        _, root = self.get_xml(reverse('posts:index_feed', args=('atom',)))
+        self.assertEqual(
+            root.find(f'{ATOM}entry/{ATOM}content').text, 'Текст с мусором'
+        )
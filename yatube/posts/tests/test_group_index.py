@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupIndexTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='grouped')
+        cls.quiet = Group.objects.create(
+            title='Тихая', slug='quiet', description='Тестовое описание',
+        )
+        cls.busy = Group.objects.create(
+            title='Шумная', slug='busy', description='Тестовое описание',
+        )
+        cls.empty = Group.objects.create(
+            title='Пустая', slug='empty', description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:group_index')
+
+    def create_post(self, group, text='Тестовый пост'):
+        return Post.objects.create(author=self.user, text=text, group=group)
+
+    def stats(self, group):
+        return GroupStats.objects.get(group=group)
+
+    def test_stats_follow_post_writes(self):
+        self.assertEqual(self.stats(self.empty).post_count, 0)
+        first = self.create_post(self.busy)
+        posts = [self.create_post(self.busy) for _ in range(3)]
+        stats = self.stats(self.busy)
+        self.assertEqual(stats.post_count, 4)
+        self.assertEqual(stats.last_activity, posts[-1].pub_date)
+        self.assertEqual(
+            stats.recent_post_ids, [post.pk for post in reversed(posts)]
+        )
+        posts[-1].group = self.quiet
+        posts[-1].save()
+        self.assertEqual(self.stats(self.quiet).recent_post_ids, [
+            posts[-1].pk
+        ])
+        posts[1].delete()
+        self.assertEqual(
+            self.stats(self.busy).recent_post_ids, [posts[0].pk, first.pk]
+        )
+        self.assertEqual(self.stats(self.busy).post_count, 2)
+
+    def test_directory_lists_every_group_by_activity(self):
+        self.create_post(self.quiet, 'Старый пост')
+        for num in range(4):
+            self.create_post(self.busy, f'Пост {num}')
+        # Подсчёт, страница сводок и превью всех групп страницы.
+        with self.assertNumQueries(3):
+            response = Client().get(self.url)
+        page = list(response.context['page_obj'])
+        self.assertEqual(
+            [stats.group for stats in page],
+            [self.busy, self.quiet, self.empty],
+        )
+        self.assertEqual(page[0].post_count, 4)
+        self.assertEqual(
+            [post.text for post in page[0].recent_posts],
+            ['Пост 3', 'Пост 2', 'Пост 1'],
+        )
+        self.assertEqual(page[2].recent_posts, [])
+        self.assertContains(response, self.empty.title)
+
+    def test_new_post_invalidates_cached_directory(self):
+        client = Client()
+        client.get(self.url)
+        self.create_post(self.quiet, 'Свежий пост')
+        self.assertContains(client.get(self.url), 'Свежий пост')
+
+    def test_rebuild_command_backfills_summaries(self):
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Импорт', group=self.quiet)
+            for _ in range(2)
+        ])
+        call_command('rebuild_group_summaries', stdout=StringIO())
+        stats = self.stats(self.quiet)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(len(stats.recent_post_ids), 2)
+        self.assertIsNotNone(stats.last_activity)
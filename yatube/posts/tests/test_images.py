@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from posts.images import POST_IMAGE_MAX_SIZE, store_image
+from posts.models import Post
+
+User = get_user_model()
+
+
+def upload(size=(3000, 1500), mode='RGB', image_format='PNG',
+           name='big.png'):
+    buffer = BytesIO()
+    Image.new(mode, size, (255, 0, 0, 128)[:len(mode)]).save(
+        buffer, image_format
+    )
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+class ImagePipelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='photographer')
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def stored_files(self):
+        return [
+            name for _, _, names in os.walk(self.media_root) for name in names
+        ]
+
+    def test_large_upload_is_resized_and_reencoded(self):
+        name = store_image(upload())
+        self.assertRegex(name, r'^posts/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        with default_storage.open(name) as file:
+            image = Image.open(file)
+            self.assertEqual(image.format, 'JPEG')
+            self.assertLessEqual(image.width, POST_IMAGE_MAX_SIZE[0])
+            self.assertEqual(image.size, (1920, 960))
+
+    def test_transparent_upload_stays_png(self):
+        name = store_image(upload((30, 30), 'RGBA'))
+        self.assertTrue(name.endswith('.png'))
+
+    def test_identical_uploads_are_stored_once(self):
+        first = store_image(upload(name='first.png'))
+        second = store_image(upload(name='second.png'))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_broken_upload_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            store_image(SimpleUploadedFile('bad.png', b'not an image'))
+
+    def test_create_and_edit_post_with_image(self):
+        self.client.post(
+            reverse('posts:post_create'),
+            {'text': 'Пост с картинкой', 'image': upload()},
+        )
+        post = Post.objects.get(text='Пост с картинкой')
+        self.assertEqual(post.image.name, store_image(upload()))
+        self.client.post(
+            reverse('posts:post_edit', args=(post.pk,)),
+            {'text': 'Новая картинка', 'image': upload((100, 50))},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.image.height, 50)
+        self.assertEqual(len(self.stored_files()), 2)
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+
+from django.test import SimpleTestCase, override_settings
+
+from core.media import IMMUTABLE, SHORT_CACHE
+
+DIGEST = 'ab' * 32
+NAME = f'posts/ab/{DIGEST}.jpg'
+CONTENT = bytes(range(256)) * 4
+
+
+class MediaServeTest(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        for name in (NAME, 'posts/old.jpg', 'private/secret.txt'):
+            path = os.path.join(self.media_root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as file:
+                file.write(CONTENT)
+
+    @override_settings(
+        MEDIA_OFFLOAD='accel', MEDIA_ACCEL_PREFIX='/protected-media/'
+    )
+    def test_x_accel_redirect(self):
+        response = self.client.get(f'/media/{NAME}')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            response['X-Accel-Redirect'], f'/protected-media/{NAME}'
+        )
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_OFFLOAD='sendfile')
+    def test_x_sendfile(self):
+        response = self.client.get('/media/posts/old.jpg')
+        self.assertEqual(
+            response['X-Sendfile'],
+            os.path.join(self.media_root, 'posts', 'old.jpg'),
+        )
+        self.assertEqual(response['Cache-Control'], SHORT_CACHE)
+
+    @override_settings(MEDIA_OFFLOAD=None)
+    def test_streaming_fallback_with_ranges(self):
+        response = self.client.get(f'/media/{NAME}')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+        response = self.client.get(f'/media/{NAME}', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(
+            response['Content-Range'], f'bytes 10-19/{len(CONTENT)}'
+        )
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[10:20])
+
+        response = self.client.get(f'/media/{NAME}', HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[-5:])
+
+        response = self.client.get(
+            f'/media/{NAME}', HTTP_RANGE=f'bytes={len(CONTENT)}-'
+        )
+        self.assertEqual(
+            response.status_code, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+
+    @override_settings(MEDIA_OFFLOAD='accel')
+    def test_access_checks(self):
+        for url in (
+            '/media/private/secret.txt',
+            '/media/posts/../private/secret.txt',
+            '/media/posts/missing.jpg',
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+                self.assertFalse(response.has_header('X-Accel-Redirect'))
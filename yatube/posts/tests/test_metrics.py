@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.metrics import Histogram, registry
+from posts.models import Post
+
+User = get_user_model()
+
+
+class HistogramTest(SimpleTestCase):
+    def test_exposition_is_cumulative(self):
+        histogram = Histogram('test_seconds', 'Тест.', ('view',), (1, 5))
+        for value in (0.5, 1, 3, 7):
+            histogram.observe(('a"b',), value)
+        self.assertEqual(list(histogram.samples()), [
+            ('test_seconds_bucket{view="a\\"b",le="1"}', 2),
+            ('test_seconds_bucket{view="a\\"b",le="5"}', 3),
+            ('test_seconds_bucket{view="a\\"b",le="+Inf"}', 4),
+            ('test_seconds_sum{view="a\\"b"}', 11.5),
+            ('test_seconds_count{view="a\\"b"}', 4),
+        ])
+
+
+@override_settings(METRICS_TOKEN='scrape-token')
+class MetricsMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='measured')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.client = Client()
+
+    def metrics(self):
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-token'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response['Content-Type'].startswith(
+            'text/plain; version=0.0.4'
+        ))
+        return dict(
+            line.rsplit(' ', 1) for line in response.content.decode().split(
+                '\n'
+            ) if line and not line.startswith('#')
+        )
+
+    def test_views_are_recorded_by_url_name(self):
+        self.client.get(reverse('posts:index'))
+        self.client.get(reverse('posts:post_detail', args=(self.post.pk,)))
+        metrics = self.metrics()
+        self.assertEqual(metrics[
+            'yatube_requests_total{view="posts:index",method="GET",'
+            'status="200"}'
+        ], '1')
+        self.assertEqual(metrics[
+            'yatube_request_duration_seconds_count{view="posts:post_detail"}'
+        ], '1')
+        self.assertGreater(int(metrics[
+            'yatube_request_db_queries_sum{view="posts:post_detail"}'
+        ]), 0)
+        self.assertGreater(float(metrics[
+            'yatube_request_template_seconds_sum{view="posts:index"}'
+        ]), 0)
+        self.assertGreater(float(metrics[
+            'yatube_response_size_bytes_sum{view="posts:index"}'
+        ]), 0)
+
+    def test_metrics_require_token(self):
+        for authorization in ('', 'Bearer wrong', 'scrape-token'):
+            with self.subTest(authorization=authorization):
+                response = self.client.get(
+                    reverse('metrics'), HTTP_AUTHORIZATION=authorization
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.FORBIDDEN
+                )
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_metrics_closed_without_token(self):
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer None'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    def test_bench_metrics_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'metrics.json')
+            call_command(
+                'bench_metrics', requests=2, output=output, stdout=StringIO()
+            )
+            with open(output, encoding='utf-8') as file:
+                report = json.load(file)
+        result = report['results'][reverse('posts:index')]
+        self.assertEqual(result['plain_ms']['count'], 2)
+        self.assertIn('overhead_p50_ms', result)
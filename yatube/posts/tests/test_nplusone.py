@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.nplusone import NPlusOneDetected, NPlusOneDetector, normalize
+from posts import views
+from posts.models import Post
+
+User = get_user_model()
+AUTHORS_COUNT = 4
+
+
+class NPlusOneDetectorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for num in range(AUTHORS_COUNT):
+            Post.objects.create(
+                author=User.objects.create_user(username=f'writer{num}'),
+                text=f'Пост {num}',
+            )
+
+    def test_normalize(self):
+        self.assertEqual(
+            normalize('SELECT 1 FROM t WHERE id IN (%s, %s, %s) LIMIT 21'),
+            'SELECT N FROM t WHERE id IN (...) LIMIT N',
+        )
+
+    def test_lookup_in_loop_is_reported_with_code_line(self):
+        with NPlusOneDetector() as detector:
+            [post.author.username for post in Post.objects.all()]
+        with self.assertRaisesRegex(
+            NPlusOneDetected,
+            rf'(?s){AUTHORS_COUNT} × SELECT .*auth_user.*'
+            r'posts/tests/test_nplusone\.py:\d+',
+        ):
+            detector.check('test', raise_error=True)
+
+    def test_lookup_in_template_is_reported_with_template_line(self):
+        template = Template(
+            '{% for post in posts %}\n{{ post.author.username }}{% endfor %}'
+        )
+        with NPlusOneDetector() as detector:
+            template.render(Context({'posts': Post.objects.all()}))
+        self.assertRegex(detector.report('test'), r'шаблон: .*:2')
+
+    def test_select_related_is_clean(self):
+        with NPlusOneDetector() as detector:
+            [post.author.username
+             for post in Post.objects.select_related('author')]
+        self.assertEqual(detector.problems(), [])
+
+    def test_middleware_raises_in_tests(self):
+        cache.clear()
+        with mock.patch.object(
+            views.Post.objects, 'select_related',
+            return_value=Post.objects.all(),
+        ):
+            with self.assertRaises(NPlusOneDetected):
+                Client().get(reverse('posts:index'))
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase
+
+from core.templatetags.pagination import ELLIPSIS, page_window
+from posts.models import Post
+from posts.paginators import EstimatedCountPaginator
+from posts.stats import get_total_post_count
+
+User = get_user_model()
+
+PAGES_COUNT = 100_000
+
+
+class PageWindowTest(SimpleTestCase):
+    def setUp(self):
+        self.paginator = Paginator(range(PAGES_COUNT), 1)
+
+    def test_window(self):
+        cases = {
+            1: [1, 2, 3, ELLIPSIS, PAGES_COUNT],
+            4: [1, 2, 3, 4, 5, 6, ELLIPSIS, PAGES_COUNT],
+            500: [1, ELLIPSIS, 498, 499, 500, 501, 502, ELLIPSIS,
+                  PAGES_COUNT],
+            PAGES_COUNT: [1, ELLIPSIS, PAGES_COUNT - 2, PAGES_COUNT - 1,
+                          PAGES_COUNT],
+        }
+        for number, expected in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    page_window(self.paginator.page(number)), expected
+                )
+
+    def test_short_range_is_not_elided(self):
+        paginator = Paginator(range(7), 1)
+        self.assertEqual(page_window(paginator.page(4)), list(range(1, 8)))
+
+    def test_rendered_links_do_not_depend_on_page_count(self):
+        html = render_to_string(
+            'includes/paginator.html',
+            {'page_obj': self.paginator.page(PAGES_COUNT // 2)},
+        )
+        self.assertEqual(html.count('<li'), 13)
+        self.assertIn(f'?page={PAGES_COUNT}"', html)
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='counted')
+        for num in range(3):
+            Post.objects.create(author=cls.user, text=f'Пост {num}')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_large_estimate_skips_count(self):
+        paginator = EstimatedCountPaginator(
+            Post.objects.all(), 10, lambda: 5000, exact_below=1000
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 5000)
+            self.assertEqual(paginator.num_pages, 500)
+
+    def test_small_estimate_is_counted_exactly(self):
+        paginator = EstimatedCountPaginator(
+            Post.objects.all(), 10, 50, exact_below=1000
+        )
+        self.assertEqual(paginator.count, 3)
+
+    def test_total_count_is_cached(self):
+        self.assertEqual(get_total_post_count(), 3)
+        Post.objects.create(author=self.user, text='Новый пост')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_total_post_count(), 3)
+        cache.clear()
+        self.assertEqual(get_total_post_count(), 4)
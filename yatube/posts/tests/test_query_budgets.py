@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import Client, RequestFactory
+
+from core.query_budget import QueryBudgetExceeded, query_budget
+from posts import urls
+from posts.models import Group, Post
+from posts.tests.utils import QueryBudgetTestCase
+
+User = get_user_model()
+POSTS_COUNT = 15
+
+
+class QueryBudgetTest(QueryBudgetTestCase):
+    """Каждый URL из posts/urls.py укладывается в свой бюджет запросов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='budget-slug',
+            description='Тестовое описание',
+        )
+        authors = [
+            User.objects.create_user(username=f'author{num}')
+            for num in range(POSTS_COUNT)
+        ]
+        for author in authors:
+            Post.objects.create(
+                author=author, text='Тестовый пост', group=cls.group
+            )
+        cls.author = authors[0]
+        cls.post = cls.author.posts.first()
+
+    def setUp(self):
+        cache.clear()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.kwargs = {
+            'posts:group_list': {'slug': self.group.slug},
+            'posts:profile': {'username': self.author.username},
+            'posts:post_detail': {'post_id': self.post.pk},
+            'posts:post_edit': {'post_id': self.post.pk},
+            'posts:index_feed': {'kind': 'atom'},
+            'posts:group_feed': {'kind': 'rss', 'slug': self.group.slug},
+            'posts:profile_feed': {
+                'kind': 'atom', 'username': self.author.username
+            },
+            'posts:api_post': {'post_id': self.post.pk},
+            'posts:api_group': {'slug': self.group.slug},
+            'posts:api_profile': {'username': self.author.username},
+        }
+
+    def url_names(self):
+        return [
+            f'{urls.app_name}:{pattern.name}'
+            for pattern in urls.urlpatterns if getattr(pattern, 'name', None)
+        ]
+
+    def test_every_view_within_budget(self):
+        for client in (Client(), self.author_client):
+            for url_name in self.url_names():
+                with self.subTest(url_name=url_name):
+                    self.assert_within_budget(
+                        client, url_name, **self.kwargs.get(url_name, {})
+                    )
+
+    @mock.patch('posts.feeds.FEED_CHUNK_SIZE', 2)
+    @mock.patch('posts.feeds.FEED_MAX_ITEMS', None)
+    def test_streamed_feed_queries_are_counted(self):
+        response = self.assert_within_budget(
+            Client(), 'posts:index_feed', kind='rss'
+        )
+        self.assertEqual(response.query_count, 1)
+
+    def test_queries_while_streaming_count_against_budget(self):
+        @query_budget(1)
+        def view(request):
+            return StreamingHttpResponse(
+                str(Post.objects.count()) for _ in range(2)
+            )
+        response = view(RequestFactory().get('/'))
+        self.assertEqual(response.query_count, 0)
+        with self.assertRaises(QueryBudgetExceeded):
+            b''.join(response.streaming_content)
+
+    def test_numbered_pages_within_budget(self):
+        for url_name in ('posts:index', 'posts:group_list', 'posts:profile'):
+            with self.subTest(url_name=url_name):
+                self.assert_within_budget(
+                    self.author_client, url_name, {'page': 2},
+                    **self.kwargs.get(url_name, {})
+                )
@@ -0,0 +1,73 @@
+import re
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?posts_post\b(?! USING)')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN для SQLite')
+class FeedQueryPlanTest(TestCase):
+    """Запросы лент идут по индексам, без полного скана и сортировки."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='planner')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='plan-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'text {num}', author=cls.user, group=cls.group)
+            for num in range(15)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def feed_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, data)
+        return response, [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+        ]
+
+    def assert_uses_index(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertNotRegex(plan, FULL_SCAN, msg=sql)
+        self.assertNotIn(TEMP_SORT, plan, msg=sql)
+
+    def test_feed_queries_use_indexes(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        )
+        for url in urls:
+            response, queries = self.feed_queries(url)
+            page_obj = response.context['page_obj']
+            for data in (
+                {'page': 2},
+                {'after': page_obj.next_cursor()},
+                {'before': page_obj.next_cursor()},
+            ):
+                queries += self.feed_queries(url, data)[1]
+            for sql in queries:
+                with self.subTest(url=url, sql=sql):
+                    self.assert_uses_index(sql)
@@ -0,0 +1,97 @@
+import time
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.db_router import (PrimaryReplicaRouter, read_from_replicas,
+                            replicas_enabled)
+from core.middleware import PIN_COOKIE, ReplicaPinningMiddleware
+from posts.cache import cache_feed, feed_etag, post_etag
+from posts.models import Post
+
+User = get_user_model()
+
+
+def replica_feed():
+    return 'feed:replica-test'
+
+
+@override_settings(REPLICA_DATABASES=['replica1'], REPLICA_PIN_SECONDS=30)
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        self.addCleanup(read_from_replicas, False)
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        read_from_replicas()
+        self.assertEqual(self.router.db_for_read(Post), 'replica1')
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+
+    def call(self, request, status=HTTPStatus.OK):
+        """Прогоняет запрос через middleware; возвращает ответ и базу."""
+        routed = []
+
+        def view(request):
+            routed.append(self.router.db_for_read(Post))
+            return HttpResponse(status=status)
+        response = ReplicaPinningMiddleware(view)(request)
+        return response, routed[0]
+
+    def test_write_pins_reads_to_primary(self):
+        response, db = self.call(self.factory.post('/create/'))
+        self.assertEqual(db, 'default')
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 30)
+        self.assertEqual(self.call(self.factory.get('/'))[1], 'replica1')
+
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = cookie.value
+        response, db = self.call(request)
+        self.assertEqual(db, 'default')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_expired_or_failed_write_does_not_pin(self):
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = str(int(time.time()) - 1)
+        self.assertEqual(self.call(request)[1], 'replica1')
+        response, _ = self.call(
+            self.factory.post('/create/'), HTTPStatus.BAD_REQUEST
+        )
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def get(self, user=None):
+        request = self.factory.get('/')
+        request.user = user or AnonymousUser()
+        return request
+
+    @override_settings(FEED_PAGE_CACHE=True)
+    def test_feed_cache_miss_reads_primary(self):
+        cache.clear()
+        routed = []
+
+        @cache_feed(replica_feed)
+        def view(request):
+            routed.append(self.router.db_for_read(Post))
+            return HttpResponse()
+        read_from_replicas()
+        view(self.get())
+        self.assertEqual(routed, ['default'])
+        self.assertTrue(replicas_enabled())
+
+    @override_settings(FEED_ETAGS=True, FEED_PAGE_CACHE=True)
+    def test_no_etags_for_pages_read_from_replica(self):
+        cached_etag = feed_etag(replica_feed, cached=True)
+        reader = self.get(User(pk=1))
+        read_from_replicas()
+        self.assertIsNotNone(cached_etag(self.get()))
+        self.assertIsNone(cached_etag(reader))
+        self.assertIsNone(feed_etag(replica_feed)(self.get()))
+        self.assertIsNone(post_etag(self.get(), 1))
+        read_from_replicas(False)
+        self.assertIsNotNone(cached_etag(reader))
@@ -0,0 +1,90 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+from posts.search import FTS_TABLE, search_posts
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 есть только в SQLite')
+class SearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='searcher')
+        cls.cat_post = Post.objects.create(
+            author=cls.user, text='Кошка спит на диване'
+        )
+        cls.dog_post = Post.objects.create(
+            author=cls.user, text='Собака гуляет во дворе'
+        )
+        cls.many_cats = Post.objects.create(
+            author=cls.user, text='Кошка, кошка и ещё одна кошка'
+        )
+
+    def search(self, query, **kwargs):
+        return list(search_posts(query, 10, **kwargs))
+
+    def test_ranked_results(self):
+        self.assertEqual(
+            self.search('кошка'), [self.many_cats, self.cat_post]
+        )
+        self.assertEqual(self.search('собака'), [self.dog_post])
+
+    def test_operators_in_query_are_escaped(self):
+        self.assertEqual(self.search('кошка AND "'), [])
+        self.assertEqual(self.search('NEAR('), [])
+
+    def test_index_follows_writes(self):
+        dog_post = Post.objects.get(pk=self.dog_post.pk)
+        dog_post.text = 'Теперь здесь кошка'
+        dog_post.save()
+        Post.objects.filter(pk=self.cat_post.pk).delete()
+        self.assertEqual(self.search('собака'), [])
+        self.assertCountEqual(
+            self.search('кошка'), [self.many_cats, self.dog_post]
+        )
+        Post.objects.bulk_create([Post(author=self.user, text='Кошка')])
+        self.assertEqual(len(self.search('кошка')), 3)
+
+    def test_keyset_pagination(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Попугай номер {num}')
+            for num in range(5)
+        )
+        first = search_posts('попугай', 3)
+        self.assertTrue(first.has_next())
+        second = search_posts('попугай', 3, after=first.next_cursor())
+        self.assertFalse(second.has_next())
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+
+    def test_search_view(self):
+        response = Client().get(reverse('posts:search'), {'q': 'собака'})
+        self.assertEqual(list(response.context['page_obj']), [self.dog_post])
+        self.assertContains(response, 'Собака гуляет во дворе')
+
+    def test_admin_uses_fts(self):
+        model_admin = site._registry[Post]
+        request = RequestFactory().get('/admin/posts/post/')
+        queryset, use_distinct = model_admin.get_search_results(
+            request, Post.objects.all(), 'кошка'
+        )
+        self.assertCountEqual(queryset, [self.cat_post, self.many_cats])
+        self.assertIn(FTS_TABLE, str(queryset.query))
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) "
+                           f"VALUES ('delete-all')")
+        self.assertEqual(self.search('собака'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('собака'), [self.dog_post])
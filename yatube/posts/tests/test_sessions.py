@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.sessions import SessionStore
+from posts.middleware import AnonymousFeedMiddleware
+from posts.models import Post
+from posts.tests.utils import SessionCacheTestCase
+
+User = get_user_model()
+
+
+class BrokenCache:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError('кэш недоступен')
+        return fail
+
+
+class SessionStoreTest(SessionCacheTestCase):
+
+    def test_session_is_read_from_cache(self):
+        session = SessionStore()
+        session['answer'] = 42
+        session.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session.session_key)['answer'], 42)
+
+    def test_cache_miss_falls_back_to_db(self):
+        session = SessionStore()
+        session['answer'] = 42
+        session.save()
+        caches['sessions'].clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(SessionStore(session.session_key)['answer'], 42)
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session.session_key)['answer'], 42)
+
+    def test_broken_cache_falls_back_to_db(self):
+        def store(session_key=None):
+            session = SessionStore(session_key)
+            session._cache = BrokenCache()
+            return session
+        with self.assertLogs('core.sessions', 'WARNING'):
+            session = store()
+            session['answer'] = 42
+            session.save()
+            loaded = store(session.session_key)
+            self.assertEqual(loaded['answer'], 42)
+            self.assertTrue(loaded.exists(session.session_key))
+            loaded.delete()
+            self.assertFalse(store().exists(session.session_key))
+
+    def test_per_process_cache_is_refused(self):
+        with override_settings(SESSION_CACHE_ALIAS='default'):
+            with self.assertRaises(ImproperlyConfigured):
+                SessionStore()
+
+
+@override_settings(FEED_ETAGS=True, FEED_PAGE_CACHE=True)
+class AnonymousFeedFastPathTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        Post.objects.create(author=cls.user, text='Пост для ленты')
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:index')
+        self.guest_client = Client()
+
+    def test_cached_feed_skips_session_and_user(self):
+        first = self.guest_client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.guest_client.get(self.url)
+        self.assertIsNone(second.wsgi_request.__dict__.get('session'))
+        self.assertIsNone(second.wsgi_request.__dict__.get('user'))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second['X-Frame-Options'], first['X-Frame-Options'])
+
+    def test_not_modified_without_rendering(self):
+        etag = self.guest_client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(
+                self.url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['Vary'], 'Cookie')
+
+    def test_cached_feed_varies_on_cookie(self):
+        self.guest_client.get(self.url)
+        response = self.guest_client.get(self.url)
+        self.assertIsNone(response.context)
+        self.assertEqual(response['Vary'], 'Cookie')
+
+    def test_any_etag_needs_cached_page(self):
+        request = RequestFactory().get(self.url, HTTP_IF_NONE_MATCH='*')
+        self.assertIsNone(AnonymousFeedMiddleware(None).cached_feed(request))
+
+    def test_logged_in_reader_takes_full_path(self):
+        self.guest_client.get(self.url)
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(self.url)
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, self.user.username)
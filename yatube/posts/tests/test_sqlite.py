@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.sqlite import apply_sqlite_pragmas
+
+
+class SqlitePragmasTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_PRAGMAS={
+        'busy_timeout': 1234, 'cache_size': -4096,
+    })
+    def test_pragmas_applied_on_connect(self):
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        self.assertEqual(self.pragma('busy_timeout'), 1234)
+        self.assertEqual(self.pragma('cache_size'), -4096)
+
+    def test_bench_sqlite_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'sqlite.json')
+            call_command(
+                'bench_sqlite', readers=2, writers=1, seconds=0.2,
+                rows=100, output=output, seed=1, stdout=StringIO(),
+            )
+            with open(output, encoding='utf-8') as file:
+                report = json.load(file)
+        self.assertEqual(set(report['results']), {'stock', 'tuned'})
+        for result in report['results'].values():
+            self.assertGreater(result['reads_per_second'], 0)
+            self.assertIn('lock_errors', result)
@@ -0,0 +1,81 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.static import IMMUTABLE, SHORT_CACHE, accepted_encodings, serve
+
+CSS = 'css/bootstrap.min.css'
+
+
+class CompressedStaticTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.static_settings = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+        )
+        cls.static_settings.enable()
+        call_command('collectstatic', interactive=False, stdout=StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.static_settings.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.hashed = static(CSS)[len(settings.STATIC_URL):]
+
+    def get(self, path, **headers):
+        return serve(self.factory.get(f'/static/{path}', **headers), path)
+
+    def test_templates_resolve_hashed_names(self):
+        self.assertRegex(
+            self.hashed, r'^css/bootstrap\.min\.[0-9a-f]{12}\.css$'
+        )
+
+    def test_gzip_sibling_is_written(self):
+        path = os.path.join(self.static_root, self.hashed)
+        with open(path, 'rb') as original, gzip.open(path + '.gz') as packed:
+            self.assertEqual(packed.read(), original.read())
+
+    def test_encoding_negotiation_and_caching(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.get(
+            self.hashed, HTTP_ACCEPT_ENCODING='gzip;q=0, *'
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.get(CSS)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Cache-Control'], SHORT_CACHE)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(
+            accepted_encodings('br;q=1.0, gzip;q=0.5, identity;q=0'),
+            {'br', 'gzip'},
+        )
+        self.assertEqual(accepted_encodings(''), set())
+        self.assertEqual(accepted_encodings('*'), {'br', 'gzip'})
+        self.assertEqual(accepted_encodings('*, gzip;q=0'), {'br'})
+        self.assertEqual(accepted_encodings('br;q=0, *'), {'gzip'})
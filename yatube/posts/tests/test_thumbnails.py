@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from PIL import Image
+
+from posts.models import Post
+from posts.thumbnails import generate_thumbnails
+
+User = get_user_model()
+
+
+def make_image(name='image.png'):
+    buffer = BytesIO()
+    Image.new('RGB', (40, 20), 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+class ImmediateExecutor:
+    def submit(self, func, *args):
+        func(*args)
+
+
+class ThumbnailPregenerationTest(TransactionTestCase):
+    def setUp(self):
+        # sorl держит ключи миниатюр в кэше: чистим, чтобы каждый тест
+        # генерировал их в свою временную MEDIA_ROOT.
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.user = User.objects.create_user(username='photographer')
+
+    def thumbnails(self):
+        cache_dir = os.path.join(self.media_root, 'cache')
+        return [
+            name for _, _, files in os.walk(cache_dir) for name in files
+        ]
+
+    def test_thumbnails_generated_after_save(self):
+        with mock.patch(
+            'posts.thumbnails.get_executor', return_value=ImmediateExecutor()
+        ):
+            Post.objects.create(
+                author=self.user, text='С картинкой', image=make_image()
+            )
+            Post.objects.create(author=self.user, text='Без картинки')
+        self.assertEqual(len(self.thumbnails()), 1)
+
+    def test_generate_thumbnails_reports_errors(self):
+        self.assertFalse(generate_thumbnails('posts/missing.png'))
+
+    def test_backfill_command(self):
+        with mock.patch('posts.thumbnails.get_executor'):
+            for num in range(3):
+                Post.objects.create(
+                    author=self.user, text='Старый пост',
+                    image=make_image(f'old{num}.png'),
+                )
+        self.assertEqual(self.thumbnails(), [])
+        call_command('generate_thumbnails', workers=2, stdout=StringIO())
+        self.assertEqual(len(self.thumbnails()), 3)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 from posts.models import Group, Post
@@ -187,6 +188,9 @@ class PaginatorViewsTest(TestCase):
 
         cls.client = Client()
 
+    def setUp(self):
+        cache.clear()
+
     def test_templates_paginator(self):
         urls = (
             reverse(
@@ -216,3 +220,40 @@ class PaginatorViewsTest(TestCase):
                         len(page_obj),
                         expected_count
                     )
+
+    def test_keyset_paginator(self):
+        """Навигация по курсорам ?after= и ?before= во всех лентах."""
+        urls = (
+            reverse("posts:index"),
+            reverse("posts:group_list", kwargs={"slug": self.group.slug}),
+            reverse("posts:profile", kwargs={"username": self.user.username}),
+        )
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        for url in urls:
+            with self.subTest(url=url):
+                first_page = self.client.get(url).context["page_obj"]
+                self.assertEqual(list(first_page), expected[:POST_NUMBER])
+                self.assertFalse(first_page.has_previous())
+                self.assertTrue(first_page.has_next())
+
+                response = self.client.get(
+                    url, {"after": first_page.next_cursor()}
+                )
+                second_page = response.context["page_obj"]
+                self.assertEqual(list(second_page), expected[POST_NUMBER:])
+                self.assertTrue(second_page.has_previous())
+                self.assertFalse(second_page.has_next())
+
+                response = self.client.get(
+                    url, {"before": second_page.previous_cursor()}
+                )
+                self.assertEqual(
+                    list(response.context["page_obj"]),
+                    expected[:POST_NUMBER]
+                )
+
+    def test_keyset_paginator_broken_cursor(self):
+        response = self.client.get(
+            reverse("posts:index"), {"after": "not-a-cursor"}
+        )
+        self.assertEqual(len(response.context["page_obj"]), POST_NUMBER)
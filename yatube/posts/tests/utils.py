@@ -0,0 +1,48 @@
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+
+from core.caches import file_session_settings
+
+
+@override_settings(QUERY_BUDGET_CHECK=True, QUERY_BUDGET_RAISE=True)
+class QueryBudgetTestCase(TestCase):
+    """Проверка бюджетов SQL-запросов, объявленных через @query_budget.
+
+    Превышение бюджета внутри view поднимает QueryBudgetExceeded,
+    поэтому тест падает при любом запросе через клиент.
+    """
+
+    def get_query_budget(self, url):
+        budget = getattr(resolve(url).func, 'query_budget', None)
+        self.assertIsNotNone(budget, f'{url}: бюджет запросов не объявлен')
+        return budget
+
+    def assert_within_budget(self, client, url_name, data=None, **kwargs):
+        url = reverse(url_name, kwargs=kwargs or None)
+        budget = self.get_query_budget(url)
+        response = client.get(url, data)
+        if response.streaming:
+            # Запросы потокового ответа считаются по ходу отдачи тела.
+            b''.join(response.streaming_content)
+        self.assertLessEqual(response.query_count, budget, url)
+        return response
+
+
+class SessionCacheTestCase(TestCase):
+    """Тесты core.sessions с общим для процессов кэшем сессий.
+
+    В настройках по умолчанию (без memcached) сессии лежат в базе.
+    """
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        session_settings = override_settings(
+            **file_session_settings(directory)
+        )
+        session_settings.enable()
+        self.addCleanup(session_settings.disable)
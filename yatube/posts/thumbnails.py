@@ -0,0 +1,55 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from sorl.thumbnail import get_thumbnail
+
+logger = logging.getLogger(__name__)
+
+# Геометрии и опции должны совпадать с тегами {% thumbnail %} в шаблонах:
+# иначе sorl посчитает другой ключ и всё равно сгенерирует миниатюру
+# прямо в запросе.
+POST_THUMBNAILS = getattr(settings, 'POST_THUMBNAILS', (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+))
+THUMBNAIL_WORKERS = getattr(settings, 'THUMBNAIL_WORKERS', 2)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=THUMBNAIL_WORKERS, thread_name_prefix='thumbnails'
+        )
+    return _executor
+
+
+def generate_thumbnails(image_name):
+    """Создаёт все миниатюры картинки; возвращает False при ошибке."""
+    try:
+        for geometry, options in POST_THUMBNAILS:
+            # Если исходник не читается, sorl пишет ошибку в лог
+            # и возвращает несуществующий файл вместо исключения.
+            if not get_thumbnail(image_name, geometry, **options).exists():
+                return False
+    except Exception:
+        logger.exception('Не удалось создать миниатюры для %s', image_name)
+        return False
+    finally:
+        # Рабочий поток открывает собственное соединение (sorl хранит
+        # ключи в БД) — закрываем его, чтобы не держать до конца процесса.
+        connections.close_all()
+    return True
+
+
+def schedule_thumbnails(post):
+    """Ставит генерацию миниатюр поста в очередь после коммита."""
+    if not post.image:
+        return
+    name = post.image.name
+    transaction.on_commit(
+        lambda: get_executor().submit(generate_thumbnails, name)
+    )
@@ -1,15 +1,36 @@
 from django.urls import path
 from django.conf.urls import include
-from . import views
+from . import api, feeds, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('about/', include('about.urls', namespace='about')),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('search/', views.search, name='search'),
+    path('feeds/<str:kind>/', feeds.index, name='index_feed'),
+    path(
+        'group/<slug:slug>/feeds/<str:kind>/',
+        feeds.group_posts,
+        name='group_feed',
+    ),
+    path(
+        'profile/<str:username>/feeds/<str:kind>/',
+        feeds.profile,
+        name='profile_feed',
+    ),
+    path('api/posts/', api.index, name='api_index'),
+    path('api/posts/<int:post_id>/', api.post_detail, name='api_post'),
+    path('api/group/<slug:slug>/posts/', api.group_posts, name='api_group'),
+    path(
+        'api/profile/<str:username>/posts/',
+        api.profile,
+        name='api_profile',
+    ),
 ]
@@ -2,60 +2,161 @@ from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, render
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import condition
 
+from core.query_budget import query_budget
 
+from .cache import (cache_feed, feed_etag, group_feed, group_index_feed,
+                    index_feed, post_etag, profile_feed)
 from .forms import PostForm
-from .models import Group, Post, User
+from .models import AuthorStats, Group, GroupStats, Post, User
+from .paginators import EstimatedCountPaginator, KeysetPage, KeysetPaginator
+from .search import search_posts
+from .stats import (get_author_post_count, get_author_summary,
+                    get_group_post_count, get_total_post_count)
 
 POST_NUMBER = 10
+GROUP_NUMBER = 20
 
+# Бюджеты @query_budget включают два запроса на загрузку сессии
+# и пользователя: request.user ленивый и читается уже внутри view.
+# Нумерованные страницы маленьких лент делают ещё и точный COUNT(*).
 
+
+def get_page(request, post_list, estimate):
+    """Страница ленты: по курсору, а для старых ссылок ?page= — по номеру.
+
+    estimate — число постов в ленте или функция, которая его вернёт;
+    вызывается только для нумерованных страниц.
+    """
+    if 'page' in request.GET:
+        paginator = EstimatedCountPaginator(
+            post_list, POST_NUMBER, estimate
+        )
+        return paginator.get_page(request.GET.get('page'))
+    paginator = KeysetPaginator(post_list, POST_NUMBER)
+    return paginator.page_from_cursor(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+
+
+@query_budget(5)
+@condition(etag_func=feed_etag(index_feed, cached=True))
+@cache_feed(index_feed)
 def index(request):
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, POST_NUMBER)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = Post.objects.select_related('author', 'group')
+    page_obj = get_page(request, post_list, get_total_post_count)
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+def attach_previews(group_stats):
+    """Раскладывает последние посты по сводкам групп одним запросом."""
+    post_ids = [pk for stats in group_stats for pk in stats.recent_post_ids]
+    posts = Post.objects.select_related('author').in_bulk(post_ids)
+    for stats in group_stats:
+        stats.recent_posts = [
+            posts[pk] for pk in stats.recent_post_ids if pk in posts
+        ]
+
+
+@query_budget(5)
+@condition(etag_func=feed_etag(group_index_feed, cached=True))
+@cache_feed(group_index_feed)
+def group_index(request):
+    # Число постов, активность и превью — из GroupStats, без агрегации.
+    # Группы без постов (last_activity NULL) SQLite при DESC ставит в конец.
+    group_stats = GroupStats.objects.select_related('group').order_by(
+        '-last_activity', '-group'
+    )
+    page_obj = Paginator(group_stats, GROUP_NUMBER).get_page(
+        request.GET.get('page')
+    )
+    attach_previews(page_obj.object_list)
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/group_index.html', context)
+
+
+@query_budget(6)
+@condition(etag_func=feed_etag(group_feed, cached=True))
+@cache_feed(group_feed)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    paginator = Paginator(post_list, POST_NUMBER)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = group.posts.select_related('author', 'group')
+    page_obj = get_page(
+        request, post_list, lambda: get_group_post_count(group)
+    )
     context = {
         'group': group,
-        'posts': post_list,
         'page_obj': page_obj
     }
     return render(request, 'posts/group_list.html', context)
 
 
+def get_first_profile_page(author_posts, summary):
+    """Первая страница профиля по id из сводки автора, без сортировки.
+
+    None, если сводка пуста, помнит меньше постов, чем нужно для
+    страницы, или отстала от базы: bulk_create, QuerySet.update()
+    и delete() минуют сигналы. post_count после них чинит
+    reconcile_post_counters.
+    """
+    post_ids = summary.latest_post_ids[:POST_NUMBER]
+    if not post_ids or len(post_ids) < min(summary.post_count, POST_NUMBER):
+        return None
+    paginator = KeysetPaginator(author_posts, POST_NUMBER)
+    posts = list(paginator.object_list.filter(pk__in=post_ids))
+    if len(posts) < len(post_ids):
+        return None
+    return KeysetPage(
+        posts, paginator,
+        has_next=summary.post_count > len(posts), has_previous=False,
+    )
+
+
+@query_budget(6)
+@condition(etag_func=feed_etag(profile_feed, cached=True))
+@cache_feed(profile_feed)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    author_posts = author.posts.select_related('author')
-    post_count = author_posts.count()
-    paginator = Paginator(author_posts, POST_NUMBER)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Шапка профиля — из сводки автора: автор и его данные одним запросом.
+    summary = get_author_summary(username)
+    first_page = not request.GET.keys() & {'page', 'after', 'before'}
+    if summary is None:
+        summary = AuthorStats(
+            author=get_object_or_404(User, username=username)
+        )
+        first_page = False
+    author = summary.author
+    author_posts = author.posts.select_related('author', 'group')
+    page_obj = None
+    if first_page:
+        page_obj = get_first_profile_page(author_posts, summary)
+    if page_obj is None:
+        page_obj = get_page(request, author_posts, summary.post_count)
     context = {
         'author': author,
-        'post_count': post_count,
+        'post_count': summary.post_count,
+        'summary': summary,
         'page_obj': page_obj
     }
     return render(request, 'posts/profile.html', context)
 
 
+@query_budget(5)
+@condition(etag_func=post_etag)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), pk=post_id
+    )
     pub_date = post.pub_date
     post_title = post.text[:30]
     author = post.author
-    author_post = author.posts.all().count()
+    author_post = get_author_post_count(author)
     context = {
         "post": post,
         "post_title": post_title,
@@ -66,9 +167,10 @@ def post_detail(request, post_id):
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(3)
 @login_required
 def post_create(request):
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
@@ -77,13 +179,20 @@ def post_create(request):
     return render(request, 'posts/create_post.html', {'form': form})
 
 
+@query_budget(4)
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), pk=post_id
+    )
     author = post.author
     if request.user != author:
         return redirect('posts:post_detail', post_id)
     elif request.user == author:
-        form = PostForm(request.POST or None, instance=post)
+        form = PostForm(
+            request.POST or None,
+            files=request.FILES or None,
+            instance=post,
+        )
         if form.is_valid():
             post.save()
             return redirect('posts:post_detail', post_id)
@@ -95,3 +204,18 @@ def post_edit(request, post_id):
         'is_edit': True
     }
     return render(request, 'posts/create_post.html', context)
+
+
+@query_budget(4)
+def search(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = None
+    if query:
+        page_obj = search_posts(
+            query, POST_NUMBER, after=request.GET.get('after')
+        )
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/search.html', context)
@@ -29,13 +29,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Выше AnonymousFeedMiddleware: заголовок нужен и ответам из кэша.
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
+    'posts.middleware.AnonymousFeedMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -66,6 +71,71 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения: DB_REPLICAS=replica1.sqlite3,replica2.sqlite3.
+# Локально это копии основной базы, см. manage.py sync_replicas.
+REPLICA_DATABASES = []
+for number, name in enumerate(
+    filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1
+):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, name.strip()),
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+# PRAGMA для каждого нового соединения с SQLite, см. settings_production.
+SQLITE_PRAGMAS = {}
+# Сколько секунд после записи клиент читает из основной базы.
+REPLICA_PIN_SECONDS = 10
+
+# Общий для всех воркеров кэш: DJANGO_MEMCACHED=127.0.0.1:11211,…
+# Без него — locmem, у каждого процесса свой.
+MEMCACHED_LOCATIONS = list(
+    filter(None, os.environ.get('DJANGO_MEMCACHED', '').split(','))
+)
+MEMCACHED_BACKEND = 'django.core.cache.backends.memcached.MemcachedCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': MEMCACHED_BACKEND, 'LOCATION': MEMCACHED_LOCATIONS,
+    } if MEMCACHED_LOCATIONS else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Сессии в кэше — только в общем для воркеров: в locmem выход или смена
+# пароля в одном воркере не дошли бы до остальных. Отдельный memcached
+# DJANGO_SESSION_MEMCACHED не теряет сессии при очистке кэша лент.
+SESSION_MEMCACHED_LOCATIONS = list(filter(None, os.environ.get(
+    'DJANGO_SESSION_MEMCACHED', ''
+).split(','))) or MEMCACHED_LOCATIONS
+if SESSION_MEMCACHED_LOCATIONS:
+    CACHES['sessions'] = {
+        'BACKEND': MEMCACHED_BACKEND,
+        'LOCATION': SESSION_MEMCACHED_LOCATIONS,
+        'KEY_PREFIX': 'sessions',
+    }
+    SESSION_ENGINE = 'core.sessions'
+    SESSION_CACHE_ALIAS = 'sessions'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Пользователь request.user лежит в том же кэше, что и сессии.
+AUTH_USER_CACHE_TIMEOUT = 300
+AUTH_USER_CACHE_VERIFY = False
+
+FEED_CACHE_TIMEOUT = 60 * 15
+# Кэш страниц лент для анонимов: None — только если кэш default общий.
+FEED_PAGE_CACHE = None
+# ETag лент и постов: None — только если кэш default общий для воркеров.
+FEED_ETAGS = None
+
+# Нумерованные страницы: оценка числа постов вместо COUNT(*).
+TOTAL_COUNT_TIMEOUT = 60
+EXACT_COUNT_LIMIT = 1000
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -97,12 +167,14 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+# Сюда collectstatic собирает статику для боевого сервера.
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.metrics.InstrumentedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -126,5 +198,27 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+# Поиск N+1: по умолчанию в DEBUG, в тестах — с исключением.
+NPLUSONE_DETECT = DEBUG
+NPLUSONE_RAISE = False
+NPLUSONE_THRESHOLD = 3
+TEST_RUNNER = 'core.test_runner.StrictDiscoverRunner'
+
+# /metrics отдаётся только с заголовком Authorization: Bearer <токен>;
+# без токена эндпоинт закрыт.
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN')
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Кто передаёт байты медиафайлов: None — сам Django (FileResponse),
+# 'accel' — nginx через X-Accel-Redirect, 'sendfile' — X-Sendfile.
+MEDIA_OFFLOAD = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+POST_THUMBNAILS = (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+)
+THUMBNAIL_WORKERS = 2
+# Картинки постов ужимаются при загрузке до этих размеров.
+POST_IMAGE_MAX_SIZE = (1920, 1920)
+POST_IMAGE_QUALITY = 85
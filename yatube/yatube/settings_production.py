@@ -0,0 +1,41 @@
+"""Настройки для боевого сервера.
+
+DJANGO_SETTINGS_MODULE=yatube.settings_production
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from core.sqlite import PRODUCTION_PRAGMAS
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+DEBUG = False
+
+# Ключ из settings.py лежит в репозитории: на сервере он только свой.
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Задайте DJANGO_SECRET_KEY.')
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+# Соединение живёт между запросами, а не открывается на каждый.
+DATABASES = {
+    alias: {**database, 'CONN_MAX_AGE': 600}
+    for alias, database in DATABASES.items()
+}
+
+# WAL, busy_timeout и прочее — см. core.sqlite.PRODUCTION_PRAGMAS.
+SQLITE_PRAGMAS = PRODUCTION_PRAGMAS
+
+# collectstatic пишет файлы с хэшем в имени и их .gz/.br копии,
+# {% static %} берёт имена из манифеста, а core.static.serve отдаёт
+# их с Cache-Control: immutable.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+SERVE_STATIC = True
+
+# nginx: location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+MEDIA_OFFLOAD = os.environ.get('DJANGO_MEDIA_OFFLOAD', 'accel') or None